@@ -1,12 +1,32 @@
 import os
+import shutil
 import re
+import time
 import arxiv
 import requests
 import logging
+import threading
+import concurrent.futures
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterable, List, Optional
 from tqdm.auto import tqdm  # 使用 tqdm.auto 以自动选择最佳进度条实现
 
+from .Paper_Catalog import PaperCatalog
+from .PDF_Store import PDFStore
+from .Arxiv_Backend import ArxivBackend
+from .Rate_Limiter import RateLimiter, RateLimitedSession
+
 class ArxivDownloader:
-    def __init__(self, download_dir: str, max_results: int = 5, sort_by: str = 'submittedDate', log_file: str = None):
+    # 增量模式下各排序方式对应的水位线日期字段；按相关度排序时无法增量
+    watermark_fields = {
+        'submittedDate': 'published',
+        'lastUpdatedDate': 'updated',
+    }
+
+    def __init__(self, download_dir: str, max_results: int = 5, sort_by: str = 'submittedDate', log_file: str = None,
+                 max_workers: int = 4, download_retries: int = 3, catalog_path: Optional[str] = None,
+                 page_size: int = 100, queue_size: int = 32, rate_limiter: Optional[RateLimiter] = None,
+                 store_dir: Optional[str] = None, backend: Optional[ArxivBackend] = None, link_store: bool = True):
         """
         初始化 ArxivDownloader 类。
 
@@ -15,10 +35,40 @@ class ArxivDownloader:
             max_results (int): 最大搜索结果数，默认5。
             sort_by (str): 排序方式，默认按提交日期排序。
             log_file (str): 日志文件路径。如果为 None，将使用控制台输出。
+            max_workers (int): 并发下载的线程数，默认4。为1时按顺序逐个下载。
+            download_retries (int): 单个文件下载中断后的续传重试次数，默认3。
+            catalog_path (Optional[str]): 论文目录数据库路径，默认为下载目录下的 catalog.sqlite3。
+            page_size (int): 每页元数据条数，默认100。增量模式下较小的值可减少到达水位线前多取的条目。
+            queue_size (int): 流式模式下已获取元数据、等待下载的结果数上限，默认32。
+            rate_limiter (Optional[RateLimiter]): 元数据分页与PDF下载共享的限流器，默认按 arXiv 建议的速率限流。
+            store_dir (Optional[str]): 内容寻址存储的根目录。设置后下载完成的PDF按 sha256 分片保存在该目录；默认不启用。
+            backend (Optional[ArxivBackend]): 元数据查询与PDF下载的后端，默认直接访问 arxiv.org；
+                                              离线测试时可传入 ReplayBackend。
+            link_store (bool): 启用存储时，是否在 download_dir 中以 "{id} - {title}.pdf" 保留指向存储文件的硬链接
+                               （无法硬链接时复制），使 PDFProcessor.process_directory_to_json 与 watch_directory
+                               可以直接处理下载目录，且不占用额外空间。默认开启；关闭后 download_dir 只存放
+                               未完成的 .part 文件，上述处理流程将看不到任何PDF。
         """
         self.download_dir = download_dir
         self.max_results = max_results
         self.sort_by = sort_by
+        self.max_workers = max(1, max_workers)
+        self.download_retries = download_retries
+        self.page_size = page_size
+        self.queue_size = max(0, queue_size)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.backend = backend or ArxivBackend()
+
+        # 翻页请求改由限流器控制间隔与重试，arxiv.Client 自身不再等待
+        self.client = arxiv.Client(page_size=page_size, delay_seconds=0)
+        self.client.query_url_format = self.backend.query_url_format
+        self.client._session = RateLimitedSession(self.rate_limiter)
+
+        # 所有下载线程共享同一个 keep-alive 会话，连接池大小与线程数一致
+        self.session = RateLimitedSession(self.rate_limiter)
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
         # 设置日志配置
         self.logger = logging.getLogger(__name__)
@@ -31,6 +81,11 @@ class ArxivDownloader:
         # 确保下载目录存在
         os.makedirs(self.download_dir, exist_ok=True)
 
+        # 已下载论文的目录，用于按 arXiv ID 与版本号去重
+        self.catalog = PaperCatalog(catalog_path or os.path.join(self.download_dir, 'catalog.sqlite3'))
+        self.store = PDFStore(store_dir) if store_dir else None
+        self.link_store = link_store
+
     def sanitize_filename(self, filename: str) -> str:
         """
         清理文件名，移除非法字符。
@@ -45,42 +100,154 @@ class ArxivDownloader:
         sanitized = sanitized.strip()
         return sanitized
 
-    def download_pdf(self, pdf_url: str, save_path: str):
+    @staticmethod
+    def _parse_content_range(value: str) -> tuple:
         """
-        下载PDF文件并保存到指定路径。
+        解析 Content-Range 响应头，例如 "bytes 100-199/200" 或 "bytes */200"。
+
+        Args:
+            value (str): 响应头的值。
+
+        Returns:
+            tuple: (起始偏移, 文件总长度)，无法解析的部分为 None。
+        """
+        match = re.match(r'bytes\s+(?:(\d+)-\d+|\*)/(\d+|\*)', value or '')
+        if not match:
+            return None, None
+        start = int(match.group(1)) if match.group(1) is not None else None
+        total = int(match.group(2)) if match.group(2) != '*' else None
+        return start, total
+
+    def _finalize_part(self, part_path: str, save_path: str, expected_size: int) -> bool:
+        """
+        校验 .part 文件，通过后原子地重命名为最终文件。
+
+        长度不足的文件保留以便续传；长度已满足但校验失败的文件视为损坏并删除。
+        长度与服务器声明的一致时以长度为准，缺少 %%EOF 结尾标记只记录警告。
+
+        Args:
+            part_path (str): 未完成文件路径。
+            save_path (str): 最终保存路径。
+            expected_size (int): 预期字节数，未知时为0。
+
+        Returns:
+            bool: 文件已就位时返回 True。
+        """
+        size = os.path.getsize(part_path)
+        if expected_size and size < expected_size:
+            self.logger.warning(f"下载未完成（{size}/{expected_size} 字节），稍后续传: {part_path}")
+            return False
+        if expected_size and size == expected_size:
+            has_header, has_eof = PDFStore.pdf_markers(part_path)
+            if not has_header:
+                self.logger.warning(f"文件头不是PDF，删除后重新下载: {part_path}")
+                os.remove(part_path)
+                return False
+            if not has_eof:
+                self.logger.warning(f"长度与预期一致但未找到 %%EOF 结尾标记，按完整文件保存: {part_path}")
+        elif not PDFStore.is_complete_pdf(part_path, expected_size):
+            if expected_size:
+                self.logger.warning(f"文件校验失败，删除后重新下载: {part_path}")
+                os.remove(part_path)
+            else:
+                self.logger.warning(f"未找到PDF结尾标记，稍后续传: {part_path}")
+            return False
+        os.replace(part_path, save_path)
+        return True
+
+    def _fetch_part(self, pdf_url: str, part_path: str) -> tuple:
+        """
+        将PDF写入 .part 文件；已有部分内容时使用 Range 请求只获取剩余字节。
 
         Args:
             pdf_url (str): PDF文件的URL。
-            save_path (str): 本地保存路径。
+            part_path (str): 未完成文件路径。
+
+        Returns:
+            tuple: (本次写入的字节数, 文件预期总长度)，总长度未知时为0。
         """
-        try:
-            response = requests.get(pdf_url, stream=True, timeout=30)
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+        with self.session.get(pdf_url, stream=True, timeout=30, headers=headers) as response:
+            if offset and response.status_code == 416:
+                # 服务器认为没有剩余字节，交由校验判断 .part 是否已完整
+                _, total = self._parse_content_range(response.headers.get('content-range'))
+                return 0, total or 0
             response.raise_for_status()  # 确保请求成功
 
-            total_size = int(response.headers.get('content-length', 0))
-            block_size = 1024  # 1 Kibibyte
+            content_length = int(response.headers.get('content-length', 0))
+            if response.status_code == 206:
+                start, total = self._parse_content_range(response.headers.get('content-range'))
+                if start != offset:
+                    os.remove(part_path)
+                    raise requests.exceptions.RequestException(f"Content-Range 起始位置 {start} 与本地 {offset} 不一致")
+                mode = 'ab'
+            else:
+                # 服务器不支持 Range 时从头开始写
+                offset, total, mode = 0, None, 'wb'
+            expected_size = total or (offset + content_length if content_length else 0)
 
-            progress_bar = tqdm(total=total_size, unit='iB', unit_scale=True, desc=os.path.basename(save_path))
+            block_size = 64 * 1024  # 64 Kibibyte
+            progress_bar = tqdm(total=expected_size, initial=offset, unit='iB', unit_scale=True,
+                                desc=os.path.basename(part_path)[:-len('.part')], leave=self.max_workers == 1)
+            written = 0
+            try:
+                with open(part_path, mode) as file:
+                    for data in response.iter_content(block_size):
+                        file.write(data)
+                        written += len(data)
+                        progress_bar.update(len(data))
+            finally:
+                progress_bar.close()
 
-            with open(save_path, 'wb') as file:
-                for data in response.iter_content(block_size):
-                    file.write(data)
-                    progress_bar.update(len(data))
+        return written, expected_size
 
-            progress_bar.close()
+    def download_pdf(self, pdf_url: str, save_path: str) -> int:
+        """
+        下载PDF文件并保存到指定路径。
 
-            if total_size != 0 and progress_bar.n != total_size:
-                self.logger.warning(f"下载可能未完成: {save_path}")
+        数据先写入 "<save_path>.part"，中断后通过 Range 请求续传；只有在长度与PDF结尾标记校验通过后，
+        才原子地重命名为 save_path。重试耗尽时保留 .part 文件，下次运行时继续续传。
 
-        except requests.exceptions.RequestException as e:
-            self.logger.error(f"下载失败: {pdf_url}\n错误信息: {e}")
+        Args:
+            pdf_url (str): PDF文件的URL。
+            save_path (str): 本地保存路径。
 
-    def search_and_download(self, keyword: str):
+        Returns:
+            int: 本次调用传输的字节数，下载失败时返回 -1。
         """
-        根据关键词搜索arXiv论文并下载PDF文件。
+        part_path = save_path + '.part'
+        transferred = 0
+
+        for attempt in range(self.download_retries + 1):
+            if attempt:
+                time.sleep(self.rate_limiter.retry_delay(pdf_url, attempt))
+            try:
+                written, expected_size = self._fetch_part(pdf_url, part_path)
+            except (requests.exceptions.RequestException, OSError) as e:
+                self.logger.warning(f"下载中断（第 {attempt + 1} 次尝试）: {pdf_url}\n错误信息: {e}")
+                continue
+            transferred += written
+            if self._finalize_part(part_path, save_path, expected_size):
+                return transferred
+
+        if os.path.exists(part_path):
+            self.logger.error(f"下载失败: {pdf_url}，未完成的文件已保留以便续传: {part_path}")
+        else:
+            self.logger.error(f"下载失败: {pdf_url}")
+        return -1
+
+    def _build_search(self, keyword: str, unbounded: bool = False) -> arxiv.Search:
+        """
+        根据关键词和排序设置构建 arxiv 搜索对象。
 
         Args:
             keyword (str): 搜索关键词。
+            unbounded (bool): 是否不限结果数。增量翻页需要一直翻到水位线，由 _walk_step 按 max_results 控制每次运行的数量。
+
+        Returns:
+            arxiv.Search: 按降序排列的搜索对象。
         """
         # 设置排序标准
         sort_criteria = {
@@ -91,35 +258,557 @@ class ArxivDownloader:
 
         sort = sort_criteria.get(self.sort_by, arxiv.SortCriterion.SubmittedDate)
 
-        # 使用 arxiv.Search 进行搜索
-        self.logger.info(f"正在搜索关键词：'{keyword}'，最多 {self.max_results} 个结果...")
-        
-        # 创建 arxiv 搜索对象
-        search = arxiv.Search(
+        return arxiv.Search(
             query=keyword,
-            max_results=self.max_results,
+            max_results=None if unbounded else self.max_results,
             sort_by=sort,
             sort_order=arxiv.SortOrder.Descending
         )
 
-        # 获取搜索结果
-        results = list(search.results())  # 使用 Search 对象来获取并转换为列表
-        self.logger.info(f"找到 {len(results)} 篇论文。\n")
+    def _load_watermark(self, keyword: str) -> Optional[dict]:
+        """
+        读取查询的增量水位线。
 
-        for idx, result in enumerate(results, start=1):
-            title = self.sanitize_filename(result.title)
-            arxiv_id = result.entry_id.split("/")[-1]  # 获取 arXiv ID
-            pdf_url = result.pdf_url
-            file_name = f"{arxiv_id} - {title}.pdf"
-            save_path = os.path.join(self.download_dir, file_name)
+        Args:
+            keyword (str): 搜索关键词。
 
-            # 检查文件是否已存在
-            if os.path.exists(save_path):
-                self.logger.info(f"{idx}/{len(results)} 已存在，跳过下载: {file_name}")
-                continue
+        Returns:
+            Optional[dict]: 水位线，当前排序方式不支持增量或尚无水位线时返回 None。
+        """
+        if self.sort_by not in self.watermark_fields:
+            self.logger.warning(f"排序方式 '{self.sort_by}' 不支持增量模式，将执行完整搜索。")
+            return None
+        watermark = self.catalog.get_watermark(keyword, self.sort_by)
+        if watermark is None:
+            self.logger.info(f"查询 '{keyword}' 尚无水位线，将执行完整搜索。")
+        else:
+            self.logger.info(f"查询 '{keyword}' 的水位线: {watermark['last_date']}（{watermark['last_id']}）")
+        return watermark
+
+    def _reached_watermark(self, result: arxiv.Result, watermark: Optional[dict]) -> bool:
+        """
+        判断降序结果是否已到达上次处理过的位置。
+
+        Args:
+            result (arxiv.Result): arXiv 搜索结果。
+            watermark (Optional[dict]): 水位线，为 None 时始终返回 False。
+
+        Returns:
+            bool: 到达水位线时返回 True。
+        """
+        if watermark is None:
+            return False
+        date = getattr(result, self.watermark_fields[self.sort_by])
+        return date < watermark['last_date'] or result.entry_id.split('/abs/')[-1] == watermark['last_id']
+
+    def _start_walk(self, keyword: str) -> Optional[dict]:
+        """
+        开始一次增量翻页，读取水位线与上次未完成翻页时已处理的区间。
+
+        Args:
+            keyword (str): 搜索关键词。
+
+        Returns:
+            Optional[dict]: 翻页状态，由 _walk_step 更新、_advance_watermark 提交；当前排序方式不支持增量时返回 None。
+        """
+        watermark = self._load_watermark(keyword)
+        if self.sort_by not in self.watermark_fields:
+            return None
+        ranges = self.catalog.get_watermark_ranges(keyword, self.sort_by) if watermark is not None else []
+        if ranges:
+            self.logger.info(
+                f"查询 '{keyword}' 上次翻页未到达水位线，已处理的 {len(ranges)} 个区间将直接跳过，"
+                f"从 {ranges[-1]['cursor_date']}（{ranges[-1]['cursor_id']}）继续。"
+            )
+        return {
+            'watermark': watermark,
+            'ranges': ranges,
+            'segment': None,
+            'verify': None,
+            'skip_range': None,
+            'newest': None,
+            'yielded': 0,
+            # 尚无水位线时只获取最新的 max_results 篇作为起点，不回溯全部历史
+            'reached': watermark is None,
+        }
+
+    @staticmethod
+    def _mark_processed(walk: dict, offset: int, date, arxiv_id: str) -> None:
+        """
+        将一条结果并入本次运行已处理的连续区间。
+
+        Args:
+            walk (dict): 翻页状态。
+            offset (int): 结果在降序结果中的位置。
+            date: 结果的排序日期。
+            arxiv_id (str): 结果的 arXiv ID（含版本号）。
+        """
+        segment = walk['segment']
+        if segment is None:
+            segment = walk['segment'] = {'top_date': date, 'top_id': arxiv_id, 'top_offset': offset}
+        segment.update(cursor_date=date, cursor_id=arxiv_id, span=offset - segment['top_offset'] + 1)
+
+    def _walk_step(self, walk: dict, result: arxiv.Result, offset: int) -> str:
+        """
+        判断增量翻页中的一条降序结果应如何处理。
+
+        有水位线时一直翻页到水位线为止，max_results 只限制每次运行交给下载的条数。上次已处理的区间不计入上限：
+        翻到区间最新的条目时直接跳到区间最早的条目（offset + span - 1）并确认其 ID，区间内的各页不再请求；
+        ID 不符（区间内条目有变动）时退回区间开头逐条翻过，按日期跳过。本次处理的条目与翻过的区间合并为一个
+        连续区间，因上限中断时与尚未到达的旧区间一起记录，下次运行继续。
+
+        Args:
+            walk (dict): _start_walk 返回的翻页状态。
+            result (arxiv.Result): arXiv 搜索结果。
+            offset (int): 结果在降序结果中的位置。
+
+        Returns:
+            str: 'yield' 交给下载，'skip' 跳过，'stop' 停止翻页，'jump' 从 walk['jump'] 处继续翻页。
+        """
+        watermark = walk['watermark']
+        if watermark is not None and self._reached_watermark(result, watermark):
+            walk['reached'] = True
+            return 'stop'
+        walk['newest'] = walk['newest'] or result
+        if watermark is None:
+            return 'yield'
+
+        date = getattr(result, self.watermark_fields[self.sort_by])
+        arxiv_id = result.entry_id.split('/abs/')[-1]
+        base_id = PaperCatalog.split_id(arxiv_id)[0]
+
+        verify = walk['verify']
+        if verify is not None:
+            walk['verify'] = None
+            if base_id == PaperCatalog.split_id(verify['cursor_id'])[0]:
+                self._mark_processed(walk, offset, date, arxiv_id)
+                return 'skip'
+            self.logger.info(f"已处理区间内的条目有变动，改为逐页翻过该区间: {verify['top_id']} - {verify['cursor_id']}")
+            walk['skip_range'] = verify
+            walk['jump'] = verify['fallback']
+            return 'jump'
+
+        ranges = walk['ranges']
+        if ranges and base_id == PaperCatalog.split_id(ranges[0]['top_id'])[0]:
+            pending = ranges.pop(0)
+            self._mark_processed(walk, offset, date, arxiv_id)
+            if pending['span'] <= 1:
+                return 'skip'
+            walk['verify'] = dict(pending, fallback=offset + 1)
+            walk['jump'] = offset + pending['span'] - 1
+            return 'jump'
+        if ranges and date < ranges[0]['top_date']:
+            # 区间最新的条目已不在结果中，按日期跳过该区间
+            walk['skip_range'] = ranges.pop(0)
+
+        skip_range = walk['skip_range']
+        if skip_range is not None:
+            if skip_range['cursor_date'] <= date <= skip_range['top_date']:
+                self._mark_processed(walk, offset, date, arxiv_id)
+                return 'skip'
+            walk['skip_range'] = None
+
+        if walk['yielded'] >= self.max_results:
+            return 'stop'
+        walk['yielded'] += 1
+        self._mark_processed(walk, offset, date, arxiv_id)
+        return 'yield'
+
+    def _walk_exhausted(self, walk: dict) -> Optional[int]:
+        """
+        结果已全部翻完时调用。跳转落在结果末尾之后时无法确认区间，退回区间开头逐条翻过。
+
+        Args:
+            walk (dict): 翻页状态。
+
+        Returns:
+            Optional[int]: 需要继续翻页的位置，已无需翻页时返回 None。
+        """
+        verify = walk['verify']
+        if verify is None:
+            return None
+        walk['verify'] = None
+        walk['skip_range'] = verify
+        return verify['fallback']
+
+    def _advance_watermark(self, keyword: str, walk: Optional[dict], stats: dict) -> None:
+        """
+        提交一次增量翻页：到达水位线时将其推进到最新条目；因 max_results 上限中断时保留水位线，
+        记录本次处理的区间与尚未到达的旧区间。有下载失败时保持不变，以便下次重试。
+
+        Args:
+            keyword (str): 搜索关键词。
+            walk (Optional[dict]): 翻页状态。
+            stats (dict): 下载统计信息。
+        """
+        if walk is None or walk['newest'] is None:
+            return
+        if stats['failed']:
+            self.logger.warning(f"有 {stats['failed']} 篇下载失败，查询 '{keyword}' 的水位线保持不变。")
+            return
+        if walk['reached']:
+            field = self.watermark_fields[self.sort_by]
+            newest = walk['newest']
+            self.catalog.set_watermark(keyword, self.sort_by, getattr(newest, field), newest.entry_id.split('/abs/')[-1])
+            self.catalog.clear_watermark_ranges(keyword, self.sort_by)
+            return
+
+        segment = walk['segment']
+        ranges = walk['ranges']
+        if segment is not None:
+            keys = ('top_date', 'top_id', 'cursor_date', 'cursor_id', 'span')
+            ranges = [{key: segment[key] for key in keys}] + ranges
+        self.catalog.set_watermark_ranges(keyword, self.sort_by, ranges)
+        if segment is not None:
+            self.logger.info(
+                f"本次已达到 {self.max_results} 篇的上限，尚未到达查询 '{keyword}' 的水位线；"
+                f"下次从 {segment['cursor_date']} 继续。"
+            )
+
+    def _iter_results(self, search: arxiv.Search, walk: Optional[dict] = None):
+        """
+        按页获取搜索结果；增量模式下翻页到水位线或本次上限为止，已处理的区间直接跳过。
+
+        Args:
+            search (arxiv.Search): 搜索对象，增量模式下应不限结果数。
+            walk (Optional[dict]): 翻页状态，为 None 时获取全部结果。
+
+        Yields:
+            arxiv.Result: 搜索结果。
+        """
+        if walk is None:
+            yield from self.client.results(search)
+            return
+
+        start = 0
+        while start is not None:
+            offset, target, seek = start, None, None
+            for result in self.client.results(search, offset=start):
+                if target is not None and offset < target:
+                    # 跳转目标在当前页内，不必重新请求
+                    offset += 1
+                    continue
+                step = self._walk_step(walk, result, offset)
+                if step == 'stop':
+                    if walk['reached']:
+                        self.logger.info("已到达水位线，停止获取更早的结果。")
+                    return
+                if step == 'yield':
+                    yield result
+                elif step == 'jump':
+                    target = walk.pop('jump')
+                    page_end = start + ((offset - start) // self.page_size + 1) * self.page_size
+                    if not offset < target < page_end:
+                        seek = target
+                        break
+                offset += 1
+            start = seek if seek is not None else self._walk_exhausted(walk)
+
+        # 已翻完全部结果
+        walk['reached'] = True
+
+    def _target_path(self, result: arxiv.Result) -> tuple:
+        """
+        计算搜索结果在本地的文件名与保存路径。
+
+        Args:
+            result (arxiv.Result): arXiv 搜索结果。
+
+        Returns:
+            tuple: (文件名, 保存路径)。
+        """
+        title = self.sanitize_filename(result.title)
+        arxiv_id = result.entry_id.split("/")[-1]  # 获取 arXiv ID
+        file_name = f"{arxiv_id} - {title}.pdf"
+        return file_name, os.path.join(self.download_dir, file_name)
+
+    def _is_harvested(self, result: arxiv.Result, save_path: str) -> bool:
+        """
+        通过论文目录判断该结果是否已下载过相同或更新的版本。
+
+        目录中没有记录但目标文件已存在时（例如启用目录之前下载的文件），补录后视为已下载。
+
+        Args:
+            result (arxiv.Result): arXiv 搜索结果。
+            save_path (str): 本地保存路径。
+
+        Returns:
+            bool: 无需下载时返回 True。
+        """
+        arxiv_id, version = PaperCatalog.split_id(result.entry_id)
+        if not self.catalog.needs_download(arxiv_id, version):
+            if self.store is not None:
+                # 补建启用链接之前存入存储的文件
+                self._link_from_store(self.catalog.get(arxiv_id)['pdf_path'], save_path)
+            return True
+        if self.catalog.get(arxiv_id) is None and os.path.exists(save_path):
+            self._record_download(result, save_path)
+            return True
+        return False
+
+    def _record_download(self, result: arxiv.Result, save_path: str) -> None:
+        """
+        将已就位的PDF登记到论文目录；启用内容寻址存储时先将文件移入存储，目录中记录的是存储路径，
+        下载目录中保留以原文件名指向存储的硬链接（link_store）。
+
+        Args:
+            result (arxiv.Result): arXiv 搜索结果。
+            save_path (str): 本地保存路径。
+        """
+        arxiv_id, version = PaperCatalog.split_id(result.entry_id)
+        if self.store is not None:
+            digest, pdf_path = self.store.put(save_path)
+            self._link_from_store(pdf_path, save_path)
+        else:
+            digest, pdf_path = PaperCatalog.file_sha256(save_path), save_path
+        self.catalog.record(
+            arxiv_id, version, result.title, result.categories, pdf_path, os.path.getsize(pdf_path), digest
+        )
+
+    def _link_from_store(self, blob_path: Optional[str], save_path: str) -> None:
+        """
+        在下载目录中以原文件名创建指向存储文件的硬链接，跨文件系统等无法硬链接时复制。
+
+        先在临时名下创建再重命名，watch_directory 看到的始终是完整的文件。
+
+        Args:
+            blob_path (Optional[str]): 存储中的文件路径。
+            save_path (str): 下载目录中的目标路径，已存在时不做任何事。
+        """
+        if not self.link_store or not blob_path or os.path.exists(save_path) or not os.path.exists(blob_path):
+            return
+        tmp_path = f"{save_path}.link"
+        try:
+            os.link(blob_path, tmp_path)
+        except OSError:
+            shutil.copyfile(blob_path, tmp_path)
+        os.replace(tmp_path, save_path)
+
+    def verify_store(self, deep: bool = False, repair: bool = False) -> List[str]:
+        """
+        检查内容寻址存储中的PDF，找出文件损坏或被截断的论文。
+
+        Args:
+            deep (bool): 是否重新计算 sha256，默认只检查文件头与 %%EOF 结尾标记。
+            repair (bool): 是否删除损坏的文件并从论文目录中移除对应记录，使下次运行时重新下载。
+
+        Returns:
+            List[str]: 受影响论文的 arXiv ID（不带版本号）。
+        """
+        if self.store is None:
+            return []
+        affected = []
+        for digest in self.store.scan(deep=deep):
+            arxiv_ids = self.catalog.ids_for_sha256(digest)
+            self.logger.warning(f"存储中的文件已损坏: {digest}（{', '.join(arxiv_ids) or '无目录记录'}）")
+            if repair:
+                os.remove(self.store.path_for(digest))
+                for arxiv_id in arxiv_ids:
+                    self.catalog.remove(arxiv_id)
+            affected.extend(arxiv_ids)
+        return affected
+
+    def _download_result(self, idx: int, total: int, result: arxiv.Result) -> tuple:
+        """
+        下载单条搜索结果对应的PDF，论文目录中已有相同或更新版本时跳过。
+
+        Args:
+            idx (int): 结果序号（从1开始）。
+            total (int): 结果总数，仅用于日志。
+            result (arxiv.Result): arXiv 搜索结果。
+
+        Returns:
+            tuple: (状态, 字节数)，状态为 'downloaded'、'skipped' 或 'failed'。
+        """
+        file_name, save_path = self._target_path(result)
+
+        # 检查论文是否已下载
+        if self._is_harvested(result, save_path):
+            self.logger.info(f"{idx}/{total} 已存在，跳过下载: {file_name}")
+            return 'skipped', 0
+
+        self.logger.info(f"{idx}/{total} 正在下载: {file_name}")
+        size = self.download_pdf(self.backend.resolve_pdf_url(result), save_path)
+        if size < 0:
+            return 'failed', 0
+        self._record_download(result, save_path)
+        self.logger.info(f"{idx}/{total} 下载完成: {file_name}\n")
+        return 'downloaded', size
+
+    def _download_all(self, results: Iterable[arxiv.Result]) -> tuple:
+        """
+        使用线程池下载一批搜索结果。
+
+        结果可以是列表，也可以是边翻页边产出的生成器：已提交但未完成的下载最多
+        max_workers + queue_size 个，队列满时暂停消费生成器，从而对翻页形成背压。
+
+        Args:
+            results (Iterable[arxiv.Result]): arXiv 搜索结果。
+
+        Returns:
+            tuple: (统计信息, {不带版本号的 arXiv ID: 状态})。
+        """
+        stats = {'downloaded': 0, 'skipped': 0, 'failed': 0, 'bytes': 0}
+        statuses = {}
+        total = len(results) if isinstance(results, list) else self.max_results
+        slots = threading.BoundedSemaphore(self.max_workers + self.queue_size)
+        start_time = time.perf_counter()
+
+        def collect(future, arxiv_id):
+            status, size = future.result()
+            statuses[arxiv_id] = status
+            stats[status] += 1
+            stats['bytes'] += size
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            for idx, result in enumerate(results, start=1):
+                slots.acquire()
+                future = executor.submit(self._download_result, idx, total, result)
+                future.add_done_callback(lambda _: slots.release())
+                pending[future] = PaperCatalog.split_id(result.entry_id)[0]
+
+                # 及时回收已完成的任务，避免长时间运行时积累
+                for done in [f for f in pending if f.done()]:
+                    collect(done, pending.pop(done))
+
+            for future in concurrent.futures.as_completed(pending):
+                collect(future, pending[future])
+
+        stats['elapsed'] = time.perf_counter() - start_time
+        return stats, statuses
+
+    @staticmethod
+    def _merge_results(query_results: Dict[str, list]) -> tuple:
+        """
+        按 arXiv ID 合并多个查询的结果，同一论文保留最高版本。
+
+        Args:
+            query_results (Dict[str, list]): {查询: 搜索结果列表}。
+
+        Returns:
+            tuple: (去重后的结果列表, {不带版本号的 arXiv ID: 命中的查询列表})。
+        """
+        merged = {}
+        matches = {}
+        for query, results in query_results.items():
+            for result in results:
+                arxiv_id, version = PaperCatalog.split_id(result.entry_id)
+                if arxiv_id not in merged or version > PaperCatalog.split_id(merged[arxiv_id].entry_id)[1]:
+                    merged[arxiv_id] = result
+                matches.setdefault(arxiv_id, [])
+                if query not in matches[arxiv_id]:
+                    matches[arxiv_id].append(query)
+        return list(merged.values()), matches
+
+    def _advance_query_watermarks(self, query_results: Dict[str, list], walks: Dict[str, Optional[dict]],
+                                  statuses: Dict[str, str]) -> None:
+        """
+        分别推进每个查询的水位线，只有该查询命中的论文全部下载成功时才推进。
+
+        Args:
+            query_results (Dict[str, list]): {查询: 搜索结果列表}。
+            walks (Dict[str, Optional[dict]]): {查询: 翻页状态}。
+            statuses (Dict[str, str]): {不带版本号的 arXiv ID: 状态}。
+        """
+        for query, results in query_results.items():
+            failed = sum(statuses.get(PaperCatalog.split_id(result.entry_id)[0]) == 'failed' for result in results)
+            self._advance_watermark(query, walks.get(query), {'failed': failed})
+
+    def _report_throughput(self, stats: dict, elapsed: float) -> dict:
+        """
+        汇总并记录本次下载的吞吐量。
+
+        Args:
+            stats (dict): 各状态计数及总字节数。
+            elapsed (float): 下载阶段耗时（秒）。
+
+        Returns:
+            dict: 补充了耗时与吞吐量字段的统计信息。
+        """
+        stats['elapsed'] = elapsed
+        stats['files_per_sec'] = stats['downloaded'] / elapsed if elapsed > 0 else 0.0
+        stats['mb_per_sec'] = stats['bytes'] / (1024 * 1024) / elapsed if elapsed > 0 else 0.0
+        self.logger.info(
+            f"下载 {stats['downloaded']} 篇，跳过 {stats['skipped']} 篇，失败 {stats['failed']} 篇；"
+            f"共 {stats['bytes'] / (1024 * 1024):.2f} MB，耗时 {elapsed:.2f} 秒，"
+            f"吞吐量 {stats['mb_per_sec']:.2f} MB/s（{stats['files_per_sec']:.2f} 篇/秒，并发数 {self.max_workers}）"
+        )
+        stats['rate_limiter'] = self.rate_limiter.snapshot()
+        for host, counter in stats['rate_limiter'].items():
+            self.logger.info(
+                f"{host}: 请求 {counter['requests']} 次，被限流 {counter['throttled']} 次，"
+                f"重试 {counter['retried']} 次，限速等待 {counter['waited']:.1f} 秒"
+            )
+        return stats
+
+    def search_and_download(self, keyword: str, incremental: bool = False, stream: bool = True) -> dict:
+        """
+        根据关键词搜索arXiv论文并并发下载PDF文件。
+
+        Args:
+            keyword (str): 搜索关键词。
+            incremental (bool): 是否启用增量模式。启用时一直翻页到上次记录的水位线为止，max_results 只限制
+                                每次运行下载的篇数；全部下载成功且到达水位线后再推进水位线，因上限中断时
+                                记录已处理的区间，下次运行跳过这些区间从中断处继续。
+            stream (bool): 是否流式处理。启用时每页元数据到达后立即交给下载线程，翻页与下载重叠；
+                           关闭时先取完全部结果再开始下载。
+
+        Returns:
+            dict: 下载统计信息（下载/跳过/失败数、字节数、耗时与吞吐量）。
+        """
+        # 使用 arxiv.Search 进行搜索
+        self.logger.info(f"正在搜索关键词：'{keyword}'，最多 {self.max_results} 个结果...")
+        walk = self._start_walk(keyword) if incremental else None
+        search = self._build_search(keyword, unbounded=walk is not None and walk['watermark'] is not None)
+
+        # 获取搜索结果；结果按日期降序
+        results = self._iter_results(search, walk)
+        if not stream:
+            results = list(results)
+            self.logger.info(f"找到 {len(results)} 篇论文。\n")
+
+        stats, statuses = self._download_all(results)
+        if stream:
+            self.logger.info(f"找到 {len(statuses)} 篇论文。")
+
+        if incremental:
+            self._advance_watermark(keyword, walk, stats)
+        self._report_throughput(stats, stats['elapsed'])
+        self.logger.info("所有下载任务完成。")
+        return stats
+
+    def search_and_download_many(self, queries: List[str], incremental: bool = False) -> dict:
+        """
+        依次执行多个查询，按 arXiv ID 合并结果后统一下载。
+
+        所有查询共用同一个 arxiv.Client（共享请求间隔）和同一个下载线程池，
+        被多个查询命中的论文只下载一次，命中关系记录在论文目录中。
+
+        Args:
+            queries (List[str]): 关键词或分类查询列表，重复的查询只执行一次。
+            incremental (bool): 是否启用增量模式，每个查询使用各自的水位线。
+
+        Returns:
+            dict: 下载统计信息，'matches' 字段为 {arXiv ID: 命中的查询列表}。
+        """
+        query_results = {}
+        walks = {}
+        for query in dict.fromkeys(queries):
+            self.logger.info(f"正在搜索关键词：'{query}'，最多 {self.max_results} 个结果...")
+            walk = walks[query] = self._start_walk(query) if incremental else None
+            search = self._build_search(query, unbounded=walk is not None and walk['watermark'] is not None)
+            query_results[query] = list(self._iter_results(search, walk))
+
+        results, matches = self._merge_results(query_results)
+        self.catalog.record_matches(matches)
+        self.logger.info(f"{len(query_results)} 个查询共找到 {len(results)} 篇不重复的论文。\n")
 
-            self.logger.info(f"{idx}/{len(results)} 正在下载: {file_name}")
-            self.download_pdf(pdf_url, save_path)
-            self.logger.info(f"{idx}/{len(results)} 下载完成: {file_name}\n")
+        stats, statuses = self._download_all(results)
 
+        if incremental:
+            self._advance_query_watermarks(query_results, walks, statuses)
+        stats['matches'] = matches
+        self._report_throughput(stats, stats['elapsed'])
         self.logger.info("所有下载任务完成。")
+        return stats
@@ -0,0 +1,299 @@
+import os
+import re
+import json
+import time
+import random
+import hashlib
+import threading
+import http.server
+from typing import Optional
+from urllib.parse import urlsplit, parse_qs
+
+import arxiv
+from .Rate_Limiter import RateLimiter, RateLimitedSession
+
+
+class ArxivBackend:
+    """
+    ArxivDownloader 的搜索/下载后端，决定元数据查询地址与PDF下载地址。
+
+    默认后端直接访问 arxiv.org；子类可以把请求指向镜像或本地回放服务。
+    """
+
+    query_url_format = arxiv.Client.query_url_format
+
+    def resolve_pdf_url(self, result: arxiv.Result) -> str:
+        """
+        返回搜索结果对应的PDF下载地址。
+
+        Args:
+            result (arxiv.Result): arXiv 搜索结果。
+
+        Returns:
+            str: PDF的URL。
+        """
+        return result.pdf_url
+
+    def close(self) -> None:
+        """
+        释放后端占用的资源。
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ReplayBackend(ArxivBackend):
+    """
+    离线回放后端：在本地HTTP服务上提供事先录制的 Atom 结果页和PDF，用于可复现的吞吐量、
+    并发扩展与断点续传测试。
+
+    录制目录结构::
+
+        root/
+            index.json          {查询: feeds 下的文件名}
+            feeds/<key>.xml     该查询录制到的全部 Atom 条目
+            pdfs/<id>.pdf       PDF文件，旧式ID中的 "/" 替换为 "_"
+
+    服务端按请求的 start/max_results 重新分页，PDF接口支持 Range 请求，并可模拟延迟、带宽上限
+    与随机断连。
+    """
+
+    def __init__(self, root: str, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 bandwidth: Optional[float] = None, fail_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        启动本地回放服务。
+
+        Args:
+            root (str): 录制目录。
+            host (str): 监听地址，默认 127.0.0.1。
+            port (int): 监听端口，默认由系统分配。
+            latency (float): 每个请求的附加延迟（秒），默认0。
+            bandwidth (Optional[float]): 每个连接的带宽上限（字节/秒），默认不限。
+            fail_rate (float): PDF请求在传输一半时断开连接的概率，用于测试续传，默认0。
+            seed (Optional[int]): 断连模拟的随机种子。
+        """
+        self.root = root
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.fail_rate = fail_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.feeds = self._load_feeds(root)
+
+        self.server = http.server.ThreadingHTTPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+        self.base_url = f"http://{host}:{self.server.server_address[1]}"
+        self.query_url_format = self.base_url + "/api/query?{}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def feed_key(query: str) -> str:
+        """
+        查询对应的录制文件名。
+
+        Args:
+            query (str): 搜索关键词。
+
+        Returns:
+            str: feeds 目录下的文件名。
+        """
+        return hashlib.sha1(query.encode('utf-8')).hexdigest()[:16] + '.xml'
+
+    @staticmethod
+    def pdf_name(arxiv_id: str) -> str:
+        """
+        带版本号的 arXiv ID 对应的PDF文件名。
+
+        Args:
+            arxiv_id (str): 带版本号的 arXiv ID。
+
+        Returns:
+            str: pdfs 目录下的文件名。
+        """
+        return arxiv_id.replace('/', '_') + '.pdf'
+
+    @staticmethod
+    def _load_feeds(root: str) -> dict:
+        index_path = os.path.join(root, 'index.json')
+        if not os.path.exists(index_path):
+            return {}
+        with open(index_path, 'r', encoding='utf-8') as file:
+            index = json.load(file)
+        feeds = {}
+        for query, file_name in index.items():
+            with open(os.path.join(root, 'feeds', file_name), 'r', encoding='utf-8') as file:
+                feeds[query] = re.findall(r'<entry>.*?</entry>', file.read(), re.DOTALL)
+        return feeds
+
+    def resolve_pdf_url(self, result: arxiv.Result) -> str:
+        return f"{self.base_url}/pdf/{result.entry_id.split('/abs/')[-1]}"
+
+    def _should_fail(self) -> bool:
+        with self._random_lock:
+            return self._random.random() < self.fail_rate
+
+    def _render_feed(self, query: str, start: int, max_results: int) -> bytes:
+        entries = self.feeds.get(query, [])
+        page = entries[start:start + max_results]
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+            'xmlns:arxiv="http://arxiv.org/schemas/atom">\n'
+            f'<title>ArXiv Query: {query}</title>\n'
+            f'<opensearch:totalResults>{len(entries)}</opensearch:totalResults>\n'
+            f'<opensearch:startIndex>{start}</opensearch:startIndex>\n'
+            f'<opensearch:itemsPerPage>{len(page)}</opensearch:itemsPerPage>\n'
+            + '\n'.join(page) +
+            '\n</feed>\n'
+        ).encode('utf-8')
+
+    def _make_handler(self):
+        backend = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, headers: Optional[dict] = None):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self, body: bytes, limit: Optional[int] = None):
+                chunk = 64 * 1024
+                sent = 0
+                end = len(body) if limit is None else limit
+                while sent < end:
+                    piece = body[sent:min(sent + chunk, end)]
+                    self.wfile.write(piece)
+                    sent += len(piece)
+                    if backend.bandwidth:
+                        time.sleep(len(piece) / backend.bandwidth)
+
+            def do_GET(self):
+                if backend.latency:
+                    time.sleep(backend.latency)
+                url = urlsplit(self.path)
+                if url.path == '/api/query':
+                    params = parse_qs(url.query)
+                    body = backend._render_feed(
+                        params.get('search_query', [''])[0],
+                        int(params.get('start', ['0'])[0]),
+                        int(params.get('max_results', ['10'])[0]),
+                    )
+                    self._send(200, body, {'Content-Type': 'application/atom+xml; charset=utf-8'})
+                elif url.path.startswith('/pdf/'):
+                    self._serve_pdf(url.path[len('/pdf/'):])
+                else:
+                    self._send(404, b'')
+
+            def _serve_pdf(self, arxiv_id: str):
+                path = os.path.join(backend.root, 'pdfs', backend.pdf_name(arxiv_id))
+                if not os.path.exists(path):
+                    self._send(404, b'')
+                    return
+                with open(path, 'rb') as file:
+                    data = file.read()
+
+                start = 0
+                match = re.match(r'bytes=(\d+)-', self.headers.get('Range', ''))
+                if match:
+                    start = int(match.group(1))
+                    if start >= len(data):
+                        self._send(416, b'', {'Content-Range': f'bytes */{len(data)}'})
+                        return
+                    self.send_response(206)
+                    self.send_header('Content-Range', f'bytes {start}-{len(data) - 1}/{len(data)}')
+                else:
+                    self.send_response(200)
+                body = data[start:]
+                self.send_header('Content-Type', 'application/pdf')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+
+                if backend._should_fail():
+                    # 只发送一半数据后断开，模拟传输中断
+                    self._stream(body, len(body) // 2)
+                    self.close_connection = True
+                    return
+                self._stream(body)
+
+        return Handler
+
+    def close(self) -> None:
+        """
+        停止本地回放服务。
+        """
+        self.server.shutdown()
+        self.server.server_close()
+
+    @classmethod
+    def record(cls, root: str, query: str, max_results: int = 50,
+               sort_by: arxiv.SortCriterion = arxiv.SortCriterion.SubmittedDate, page_size: int = 100,
+               with_pdfs: bool = True, rate_limiter: Optional[RateLimiter] = None) -> int:
+        """
+        从 arxiv.org 录制一个查询的结果页（以及PDF），供 ReplayBackend 回放。
+
+        Args:
+            root (str): 录制目录，已有内容会被合并。
+            query (str): 搜索关键词。
+            max_results (int): 最多录制的结果数，默认50。
+            sort_by (arxiv.SortCriterion): 排序方式，默认按提交日期降序。
+            page_size (int): 每页结果数，默认100。
+            with_pdfs (bool): 是否同时下载PDF，默认开启。
+            rate_limiter (Optional[RateLimiter]): 限流器，默认按 arXiv 建议的速率限流。
+
+        Returns:
+            int: 录制的条目数。
+        """
+        search = arxiv.Search(query=query, max_results=max_results, sort_by=sort_by,
+                              sort_order=arxiv.SortOrder.Descending)
+        client = arxiv.Client(page_size=page_size)
+        session = RateLimitedSession(rate_limiter or RateLimiter())
+
+        entries = []
+        while len(entries) < max_results:
+            url = client._format_url(search, len(entries), min(page_size, max_results - len(entries)))
+            response = session.get(url, timeout=30)
+            response.raise_for_status()
+            page = re.findall(r'<entry>.*?</entry>', response.text, re.DOTALL)
+            if not page:
+                break
+            entries.extend(page)
+
+        os.makedirs(os.path.join(root, 'feeds'), exist_ok=True)
+        os.makedirs(os.path.join(root, 'pdfs'), exist_ok=True)
+        with open(os.path.join(root, 'feeds', cls.feed_key(query)), 'w', encoding='utf-8') as file:
+            file.write('<feed xmlns="http://www.w3.org/2005/Atom">\n' + '\n'.join(entries) + '\n</feed>\n')
+
+        index_path = os.path.join(root, 'index.json')
+        index = {}
+        if os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as file:
+                index = json.load(file)
+        index[query] = cls.feed_key(query)
+        with open(index_path, 'w', encoding='utf-8') as file:
+            json.dump(index, file, ensure_ascii=False, indent=4)
+
+        if with_pdfs:
+            for entry in entries:
+                arxiv_id = re.search(r'<id>.*?/abs/(.*?)</id>', entry).group(1)
+                pdf_path = os.path.join(root, 'pdfs', cls.pdf_name(arxiv_id))
+                if os.path.exists(pdf_path):
+                    continue
+                response = session.get(f"https://arxiv.org/pdf/{arxiv_id}", timeout=60)
+                if response.ok:
+                    with open(pdf_path, 'wb') as file:
+                        file.write(response.content)
+
+        return len(entries)
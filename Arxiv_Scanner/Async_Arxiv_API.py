@@ -0,0 +1,397 @@
+import os
+import time
+import asyncio
+from urllib.parse import urlencode
+from typing import AsyncIterator, List, Optional
+
+import aiohttp
+import arxiv
+import feedparser
+
+from .Arxiv_API import ArxivDownloader
+from .Paper_Catalog import PaperCatalog
+from .Rate_Limiter import RateLimiter
+from .Arxiv_Backend import ArxivBackend
+
+
+class AsyncArxivDownloader(ArxivDownloader):
+    """
+    基于 asyncio 的 arXiv 下载器。
+
+    查询、元数据分页与PDF流式下载全部以协程运行，并共享同一个信号量，
+    单个进程即可维持成千上万个并发下载而无需对应数量的系统线程。
+    文件命名与跳过规则与 ArxivDownloader 相同。
+    """
+
+    def __init__(self, download_dir: str, max_results: int = 5, sort_by: str = 'submittedDate', log_file: str = None,
+                 max_concurrency: int = 100, page_size: int = 100, download_retries: int = 3,
+                 catalog_path: Optional[str] = None, queue_size: int = 1000, rate_limiter: Optional[RateLimiter] = None,
+                 store_dir: Optional[str] = None, backend: Optional[ArxivBackend] = None, link_store: bool = True):
+        """
+        初始化 AsyncArxivDownloader 类。
+
+        Args:
+            download_dir (str): 下载文件保存目录。
+            max_results (int): 最大搜索结果数，默认5。
+            sort_by (str): 排序方式，默认按提交日期排序。
+            log_file (str): 日志文件路径。如果为 None，将使用控制台输出。
+            max_concurrency (int): 同时进行的请求上限（元数据分页与PDF下载共享），默认100。
+            page_size (int): 每页元数据条数，默认100。
+            download_retries (int): 单个文件下载中断后的续传重试次数，默认3。
+            catalog_path (Optional[str]): 论文目录数据库路径，默认为下载目录下的 catalog.sqlite3。
+            queue_size (int): 已获取元数据、等待下载的结果数上限，默认1000。
+            rate_limiter (Optional[RateLimiter]): 元数据分页与PDF下载共享的限流器，默认按 arXiv 建议的速率限流。
+            store_dir (Optional[str]): 内容寻址存储的根目录，默认不启用。
+            link_store (bool): 启用存储时是否在下载目录中保留指向存储文件的硬链接，默认开启。
+            backend (Optional[ArxivBackend]): 元数据查询与PDF下载的后端，默认直接访问 arxiv.org。
+        """
+        super().__init__(download_dir, max_results=max_results, sort_by=sort_by, log_file=log_file,
+                         max_workers=max_concurrency, download_retries=download_retries, catalog_path=catalog_path,
+                         page_size=page_size, queue_size=queue_size, rate_limiter=rate_limiter, store_dir=store_dir,
+                         backend=backend, link_store=link_store)
+
+    def _page_url(self, search: arxiv.Search, start: int) -> str:
+        """
+        构造一页元数据查询的URL。
+
+        Args:
+            search (arxiv.Search): 搜索对象。
+            start (int): 本页起始偏移。
+
+        Returns:
+            str: 查询URL。
+        """
+        url_args = search._url_args()
+        url_args.update({
+            'start': start,
+            'max_results': self.page_size if search.max_results is None else min(self.page_size, search.max_results - start),
+        })
+        return self.backend.query_url_format.format(urlencode(url_args))
+
+    async def _request(self, session: aiohttp.ClientSession, url: str, **kwargs) -> aiohttp.ClientResponse:
+        """
+        经过限流器发送GET请求，遇到暂时性状态码或连接错误时按 Retry-After 或抖动退避重试。
+
+        Args:
+            session (aiohttp.ClientSession): 共享的HTTP会话。
+            url (str): 请求URL。
+            **kwargs: 传给 session.get 的其他参数。
+
+        Returns:
+            aiohttp.ClientResponse: 最终的响应，调用方负责释放。
+        """
+        attempt = 0
+        while True:
+            await self.rate_limiter.wait_async(url)
+            try:
+                response = await session.get(url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                attempt += 1
+                if attempt > self.rate_limiter.max_retries:
+                    raise
+                await asyncio.sleep(self.rate_limiter.retry_delay(url, attempt))
+                continue
+
+            if response.status not in self.rate_limiter.transient_statuses \
+                    or attempt >= self.rate_limiter.max_retries:
+                return response
+
+            attempt += 1
+            delay = self.rate_limiter.retry_delay(url, attempt, response.status, response.headers.get('retry-after'))
+            response.release()
+            await asyncio.sleep(delay)
+
+    async def search(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                     keyword: str, walk: Optional[dict] = None) -> AsyncIterator[arxiv.Result]:
+        """
+        异步分页查询 arXiv，每到达一页即逐条产出结果；增量模式下翻页到水位线或本次上限为止。
+
+        Args:
+            session (aiohttp.ClientSession): 共享的HTTP会话。
+            semaphore (asyncio.Semaphore): 全局并发信号量。
+            keyword (str): 搜索关键词。
+            walk (Optional[dict]): _start_walk 返回的翻页状态，为 None 时获取全部结果。
+
+        Yields:
+            arxiv.Result: 搜索结果。
+        """
+        search = self._build_search(keyword, unbounded=walk is not None and walk['watermark'] is not None)
+        limit = float('inf') if search.max_results is None else search.max_results
+        start = 0
+
+        while start is not None and start < limit:
+            url = self._page_url(search, start)
+            async with semaphore:
+                async with await self._request(session, url) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+
+            feed = feedparser.parse(body)
+            end = start + len(feed.entries)
+            target, seek = None, None
+            for offset, entry in enumerate(feed.entries, start=start):
+                if target is not None and offset < target:
+                    # 跳转目标在当前页内，不必重新请求
+                    continue
+                try:
+                    result = arxiv.Result._from_feed_entry(entry)
+                except arxiv.Result.MissingFieldError as e:
+                    self.logger.warning(f"跳过不完整的结果: {e}")
+                    continue
+                step = self._walk_step(walk, result, offset) if walk is not None else 'yield'
+                if step == 'stop':
+                    if walk['reached']:
+                        self.logger.info("已到达水位线，停止获取更早的结果。")
+                    return
+                if step == 'yield':
+                    yield result
+                elif step == 'jump':
+                    target = walk.pop('jump')
+                    if not offset < target < end:
+                        seek = target
+                        break
+
+            if seek is not None:
+                start = seek
+            elif feed.entries and end < int(feed.feed.get('opensearch_totalresults', end)):
+                start = end
+            else:
+                start = self._walk_exhausted(walk) if walk is not None else None
+
+        if walk is not None:
+            # 已翻完全部结果
+            walk['reached'] = True
+
+    async def _fetch_part(self, session: aiohttp.ClientSession, pdf_url: str, part_path: str) -> tuple:
+        """
+        将PDF写入 .part 文件；已有部分内容时使用 Range 请求只获取剩余字节。
+
+        Args:
+            session (aiohttp.ClientSession): 共享的HTTP会话。
+            pdf_url (str): PDF文件的URL。
+            part_path (str): 未完成文件路径。
+
+        Returns:
+            tuple: (本次写入的字节数, 文件预期总长度)，总长度未知时为0。
+        """
+        offset = await asyncio.to_thread(lambda: os.path.getsize(part_path) if os.path.exists(part_path) else 0)
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+        async with await self._request(session, pdf_url, headers=headers) as response:
+            if offset and response.status == 416:
+                _, total = self._parse_content_range(response.headers.get('content-range'))
+                return 0, total or 0
+            response.raise_for_status()
+
+            content_length = int(response.headers.get('content-length', 0))
+            if response.status == 206:
+                start, total = self._parse_content_range(response.headers.get('content-range'))
+                if start != offset:
+                    await asyncio.to_thread(os.remove, part_path)
+                    raise aiohttp.ClientPayloadError(f"Content-Range 起始位置 {start} 与本地 {offset} 不一致")
+                mode = 'ab'
+            else:
+                offset, total, mode = 0, None, 'wb'
+            expected_size = total or (offset + content_length if content_length else 0)
+
+            # 文件打开、写入与关闭都在线程池中执行，慢速磁盘不会阻塞事件循环
+            written = 0
+            file = await asyncio.to_thread(open, part_path, mode)
+            try:
+                async for data in response.content.iter_chunked(64 * 1024):
+                    await asyncio.to_thread(file.write, data)
+                    written += len(data)
+            finally:
+                await asyncio.to_thread(file.close)
+
+        return written, expected_size
+
+    async def download_pdf(self, session: aiohttp.ClientSession, pdf_url: str, save_path: str) -> int:
+        """
+        异步下载PDF文件并保存到指定路径，续传与校验规则与 ArxivDownloader.download_pdf 相同。
+
+        Args:
+            session (aiohttp.ClientSession): 共享的HTTP会话。
+            pdf_url (str): PDF文件的URL。
+            save_path (str): 本地保存路径。
+
+        Returns:
+            int: 本次调用传输的字节数，下载失败时返回 -1。
+        """
+        part_path = save_path + '.part'
+        transferred = 0
+
+        for attempt in range(self.download_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.rate_limiter.retry_delay(pdf_url, attempt))
+            try:
+                written, expected_size = await self._fetch_part(session, pdf_url, part_path)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                self.logger.warning(f"下载中断（第 {attempt + 1} 次尝试）: {pdf_url}\n错误信息: {e}")
+                continue
+            transferred += written
+            if await asyncio.to_thread(self._finalize_part, part_path, save_path, expected_size):
+                return transferred
+
+        if await asyncio.to_thread(os.path.exists, part_path):
+            self.logger.error(f"下载失败: {pdf_url}，未完成的文件已保留以便续传: {part_path}")
+        else:
+            self.logger.error(f"下载失败: {pdf_url}")
+        return -1
+
+    async def _download_result(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                               idx: int, result: arxiv.Result) -> tuple:
+        """
+        下载单条搜索结果对应的PDF，论文目录中已有相同或更新版本时跳过。
+
+        Args:
+            session (aiohttp.ClientSession): 共享的HTTP会话。
+            semaphore (asyncio.Semaphore): 全局并发信号量。
+            idx (int): 结果序号（从1开始）。
+            result (arxiv.Result): arXiv 搜索结果。
+
+        Returns:
+            tuple: (状态, 字节数)，状态为 'downloaded'、'skipped' 或 'failed'。
+        """
+        file_name, save_path = self._target_path(result)
+
+        if await asyncio.to_thread(self._is_harvested, result, save_path):
+            self.logger.info(f"{idx} 已存在，跳过下载: {file_name}")
+            return 'skipped', 0
+
+        async with semaphore:
+            self.logger.info(f"{idx} 正在下载: {file_name}")
+            size = await self.download_pdf(session, self.backend.resolve_pdf_url(result), save_path)
+
+        if size < 0:
+            return 'failed', 0
+        await asyncio.to_thread(self._record_download, result, save_path)
+        self.logger.info(f"{idx} 下载完成: {file_name}")
+        return 'downloaded', size
+
+    def _open_session(self) -> aiohttp.ClientSession:
+        """
+        创建连接数上限与并发数一致的HTTP会话。
+
+        Returns:
+            aiohttp.ClientSession: 新的会话。
+        """
+        connector = aiohttp.TCPConnector(limit=self.max_workers)
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=30)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    async def search_and_download(self, keyword: str, incremental: bool = False) -> dict:
+        """
+        根据关键词异步搜索arXiv论文并下载PDF文件。
+
+        元数据每到达一页即为其中的结果创建下载任务，分页与下载相互重叠；未完成的下载任务
+        最多 max_concurrency + queue_size 个，达到上限时暂停翻页。
+
+        Args:
+            keyword (str): 搜索关键词。
+            incremental (bool): 是否启用增量模式，语义与 ArxivDownloader.search_and_download 相同。
+
+        Returns:
+            dict: 下载统计信息（下载/跳过/失败数、字节数、耗时与吞吐量）。
+        """
+        self.logger.info(f"正在搜索关键词：'{keyword}'，最多 {self.max_results} 个结果...")
+
+        walk = await asyncio.to_thread(self._start_walk, keyword) if incremental else None
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        stats = {'downloaded': 0, 'skipped': 0, 'failed': 0, 'bytes': 0}
+        start_time = time.perf_counter()
+
+        slots = asyncio.BoundedSemaphore(self.max_workers + self.queue_size)
+        found = 0
+
+        async with self._open_session() as session:
+            tasks = []
+            async for result in self.search(session, semaphore, keyword, walk):
+                found += 1
+                await slots.acquire()
+                task = asyncio.create_task(self._download_result(session, semaphore, found, result))
+                task.add_done_callback(lambda _: slots.release())
+                tasks.append(task)
+            self.logger.info(f"找到 {found} 篇论文。\n")
+
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+
+        # 抛出异常的任务计为失败，使其阻止水位线推进而不是被静默丢弃
+        for idx, outcome in enumerate(outcomes, start=1):
+            if isinstance(outcome, BaseException):
+                self.logger.error(f"{idx} 下载任务异常: {outcome!r}")
+                stats['failed'] += 1
+                continue
+            status, size = outcome
+            stats[status] += 1
+            stats['bytes'] += size
+
+        if incremental:
+            await asyncio.to_thread(self._advance_watermark, keyword, walk, stats)
+        self._report_throughput(stats, time.perf_counter() - start_time)
+        self.logger.info("所有下载任务完成。")
+        return stats
+
+    async def search_and_download_many(self, queries: List[str], incremental: bool = False) -> dict:
+        """
+        依次执行多个查询，按 arXiv ID 合并结果后统一下载，语义与 ArxivDownloader.search_and_download_many 相同。
+
+        所有查询的分页请求共享同一个请求间隔与信号量。
+
+        Args:
+            queries (List[str]): 关键词或分类查询列表，重复的查询只执行一次。
+            incremental (bool): 是否启用增量模式，每个查询使用各自的水位线。
+
+        Returns:
+            dict: 下载统计信息，'matches' 字段为 {arXiv ID: 命中的查询列表}。
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+        stats = {'downloaded': 0, 'skipped': 0, 'failed': 0, 'bytes': 0}
+        statuses = {}
+
+        async with self._open_session() as session:
+            query_results = {}
+            walks = {}
+            for query in dict.fromkeys(queries):
+                self.logger.info(f"正在搜索关键词：'{query}'，最多 {self.max_results} 个结果...")
+                walk = walks[query] = await asyncio.to_thread(self._start_walk, query) if incremental else None
+                query_results[query] = [result async for result in self.search(session, semaphore, query, walk)]
+
+            results, matches = self._merge_results(query_results)
+            await asyncio.to_thread(self.catalog.record_matches, matches)
+            self.logger.info(f"{len(query_results)} 个查询共找到 {len(results)} 篇不重复的论文。\n")
+
+            start_time = time.perf_counter()
+            outcomes = await asyncio.gather(*[
+                self._download_result(session, semaphore, idx, result)
+                for idx, result in enumerate(results, start=1)
+            ], return_exceptions=True)
+            for idx, (result, outcome) in enumerate(zip(results, outcomes), start=1):
+                if isinstance(outcome, BaseException):
+                    self.logger.error(f"{idx} 下载任务异常: {outcome!r}")
+                    outcome = ('failed', 0)
+                status, size = outcome
+                statuses[PaperCatalog.split_id(result.entry_id)[0]] = status
+                stats[status] += 1
+                stats['bytes'] += size
+
+        if incremental:
+            await asyncio.to_thread(self._advance_query_watermarks, query_results, walks, statuses)
+        stats['matches'] = matches
+        self._report_throughput(stats, time.perf_counter() - start_time)
+        self.logger.info("所有下载任务完成。")
+        return stats
+
+    def run(self, keyword: str, incremental: bool = False) -> dict:
+        """
+        在没有事件循环的环境中同步执行 search_and_download。
+
+        Args:
+            keyword (str): 搜索关键词。
+            incremental (bool): 是否启用增量模式。
+
+        Returns:
+            dict: 下载统计信息。
+        """
+        return asyncio.run(self.search_and_download(keyword, incremental))
@@ -0,0 +1,80 @@
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator
+
+
+class LazySection(Mapping):
+    """
+    One section of a compact record. Behaves like the {'text', 'start', 'end', 'length'} dictionary
+    produced by PDFProcessor, but 'text' is only sliced out of the paper's text when it is read.
+    """
+
+    def __init__(self, content: str, offsets: Dict[str, int]):
+        """
+            Args:
+                content (str): The normalized full text of the paper.
+                offsets (Dict[str, int]): The section's 'start', 'end' and 'length'.
+        """
+        self._content = content
+        self._offsets = offsets
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'text':
+            return self._content[self._offsets['start']:self._offsets['end']].strip()
+        return self._offsets[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield 'text'
+        yield from self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) + 1
+
+
+class CompactSections(Mapping):
+    """
+    A read-only view of a compact paper record, {'text': full text, 'offsets': {section: {start, end, length}}},
+    that behaves like the regular {section: {'text', 'start', 'end', 'length'}} dictionary.
+    """
+
+    def __init__(self, record: Dict[str, Any]):
+        """
+            Args:
+                record (Dict[str, Any]): A compact record as written by PDFProcessor(compact=True).
+        """
+        self.content = record['text']
+        self.offsets = record['offsets']
+
+    @staticmethod
+    def is_compact(record: Any) -> bool:
+        """
+        Checks whether a paper record uses the compact representation.
+
+            Args:
+                record (Any): A paper record loaded from JSON.
+
+            Returns:
+                bool: True for a compact record.
+        """
+        return isinstance(record, dict) and isinstance(record.get('text'), str) and 'offsets' in record
+
+    @classmethod
+    def wrap(cls, record: Dict[str, Any]) -> Mapping:
+        """
+        Returns a section mapping for any paper record, wrapping compact records and passing regular ones through.
+
+            Args:
+                record (Dict[str, Any]): A paper record loaded from JSON.
+
+            Returns:
+                Mapping: {section: {'text', 'start', 'end', 'length'}}.
+        """
+        return cls(record) if cls.is_compact(record) else record
+
+    def __getitem__(self, section: str) -> LazySection:
+        return LazySection(self.content, self.offsets[section])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
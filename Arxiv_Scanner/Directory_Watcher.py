@@ -0,0 +1,73 @@
+import os
+import time
+import threading
+from typing import Dict, List, Tuple
+
+from watchdog.events import FileSystemEvent, FileSystemEventHandler
+
+
+class SettledFileHandler(FileSystemEventHandler):
+    """
+    A watchdog event handler that tracks files with the given suffixes and reports a file once it has
+    been quiet (no create, modify, move or close event) for a debounce interval.
+
+    Files that are still being written keep producing events and are not reported. Temporary names such
+    as ArxivDownloader's ".part" files are ignored by suffix; a file renamed into place is tracked under
+    its new name.
+    """
+
+    def __init__(self, suffixes: Tuple[str, ...] = ('.pdf', '.txt')):
+        """
+            Args:
+                suffixes (Tuple[str, ...]): The lower-case file suffixes to track.
+        """
+        super().__init__()
+        self.suffixes = suffixes
+        self._last_event: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _touch(self, path: str) -> None:
+        if path.lower().endswith(self.suffixes):
+            with self._lock:
+                self._last_event[path] = time.monotonic()
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._touch(event.src_path)
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._touch(event.src_path)
+
+    def on_closed(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            self._touch(event.src_path)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        if not event.is_directory:
+            with self._lock:
+                self._last_event.pop(event.src_path, None)
+            self._touch(event.dest_path)
+
+    def on_deleted(self, event: FileSystemEvent) -> None:
+        with self._lock:
+            self._last_event.pop(event.src_path, None)
+
+    def settled(self, debounce: float) -> List[str]:
+        """
+        Removes and returns the tracked files that have been quiet for at least the debounce interval.
+
+            Args:
+                debounce (float): The quiet interval in seconds.
+
+            Returns:
+                List[str]: The settled file paths, oldest event first.
+        """
+        now = time.monotonic()
+        with self._lock:
+            ready = sorted(
+                (last, path) for path, last in self._last_event.items() if now - last >= debounce
+            )
+            for _, path in ready:
+                del self._last_event[path]
+        return [path for _, path in ready if os.path.isfile(path)]
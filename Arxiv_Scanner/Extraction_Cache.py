@@ -0,0 +1,157 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, Optional, Any
+
+
+class ExtractionCache:
+    """
+    An on-disk SQLite cache of PDFProcessor results.
+
+    Entries are keyed by the absolute file path and the processor's configuration fingerprint, and are
+    only valid while the file's size and modification time are unchanged, so a cache hit costs one stat
+    and one indexed lookup. The total size of the stored results is capped and the least recently used
+    entries are evicted first.
+    """
+
+    def __init__(self, db_path: str, max_bytes: int = 512 * 1024 * 1024):
+        """
+        Opens (and creates if necessary) the cache database.
+
+            Args:
+                db_path (str): The path to the SQLite database file.
+                max_bytes (int): The maximum total size of the cached results in bytes. Defaults to 512 MiB.
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extractions (
+                    path        TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    size        INTEGER NOT NULL,
+                    mtime_ns    INTEGER NOT NULL,
+                    data        TEXT NOT NULL,
+                    bytes       INTEGER NOT NULL,
+                    last_used   REAL NOT NULL,
+                    PRIMARY KEY (path, fingerprint)
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_extractions_last_used ON extractions (last_used)")
+
+    @staticmethod
+    def _stat(file_path: str) -> tuple:
+        stat = os.stat(file_path)
+        return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+    def get(self, file_path: str, fingerprint: str) -> tuple:
+        """
+        Looks up the cached result for a file.
+
+            Args:
+                file_path (str): The path to the processed file.
+                fingerprint (str): The configuration fingerprint of the processor.
+
+            Returns:
+                tuple: (hit, data). hit is False if there is no valid entry; data may be None when the
+                file was cached as unprocessable.
+        """
+        path, size, mtime_ns = self._stat(file_path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, data FROM extractions WHERE path = ? AND fingerprint = ?",
+                (path, fingerprint)
+            ).fetchone()
+            if row is None or row['size'] != size or row['mtime_ns'] != mtime_ns:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE extractions SET last_used = ? WHERE path = ? AND fingerprint = ?",
+                    (time.time(), path, fingerprint)
+                )
+        return True, json.loads(row['data'])
+
+    def put(self, file_path: str, fingerprint: str, data: Optional[Dict[str, Any]]) -> None:
+        """
+        Stores the result for a file, replacing any entry for an older version of it, and evicts the least
+        recently used entries if the cache grows beyond max_bytes.
+
+            Args:
+                file_path (str): The path to the processed file.
+                fingerprint (str): The configuration fingerprint of the processor.
+                data (Optional[Dict[str, Any]]): The processing result, None if the file could not be processed.
+        """
+        path, size, mtime_ns = self._stat(file_path)
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        nbytes = len(payload.encode('utf-8'))
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO extractions (path, fingerprint, size, mtime_ns, data, bytes, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (path, fingerprint) DO UPDATE SET
+                    size = excluded.size, mtime_ns = excluded.mtime_ns, data = excluded.data,
+                    bytes = excluded.bytes, last_used = excluded.last_used
+                """,
+                (path, fingerprint, size, mtime_ns, payload, nbytes, time.time())
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM extractions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for row in self._conn.execute("SELECT path, fingerprint, bytes FROM extractions ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((row['path'], row['fingerprint']))
+            total -= row['bytes']
+        self._conn.executemany("DELETE FROM extractions WHERE path = ? AND fingerprint = ?", evicted)
+        self.evictions += len(evicted)
+
+    def clear(self) -> None:
+        """
+        Removes all cached entries.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM extractions")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache counters and current size.
+
+            Returns:
+                Dict[str, Any]: A dictionary with 'hits', 'misses', 'evictions', 'entries' and 'bytes'.
+        """
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM extractions"
+            ).fetchone()
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': entries,
+                'bytes': total,
+            }
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,190 @@
+import os
+import time
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def rss_bytes(pid: int) -> Optional[int]:
+    """
+    Returns the resident set size of a process, using psutil when installed and /proc otherwise.
+
+        Args:
+            pid (int): The process id.
+
+        Returns:
+            Optional[int]: The RSS in bytes, or None if it cannot be determined on this platform.
+    """
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f'/proc/{pid}/statm', 'r') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _worker_main(processor: Any, conn: Any) -> None:
+    # Runs in the child: process one file per request until told to stop
+    while True:
+        try:
+            file_path = conn.recv()
+        except EOFError:
+            break
+        if file_path is None:
+            break
+        try:
+            reply = (True, processor.process_file(file_path))
+        except Exception as e:
+            reply = (False, f"{type(e).__name__}: {e}")
+        conn.send(reply)
+
+
+class _Worker:
+    def __init__(self, context: Any, processor: Any):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(processor, child_conn), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.file_name = None
+        self.started = 0.0
+        self.tasks = 0
+
+    def assign(self, file_name: str, file_path: str) -> None:
+        self.file_name = file_name
+        self.started = time.monotonic()
+        self.conn.send(file_path)
+
+    def stop(self, kill: bool = False) -> None:
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                pass
+            self.process.join(1)
+            if self.process.is_alive():
+                self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class GuardedPool:
+    """
+    A pool of recyclable worker processes that runs PDFProcessor.process_file under a per-file wall-clock
+    limit and a per-worker memory limit.
+
+    Unlike ProcessPoolExecutor, a worker stuck on a pathological PDF is killed and replaced on its own, so
+    one file cannot stall or take down the batch. Files that time out, exceed the memory limit or crash
+    their worker are recorded in `quarantine` with the reason. Workers are also replaced after a fixed
+    number of files to bound memory growth in long runs.
+    """
+
+    def __init__(self, processor: Any, max_workers: int = 1, timeout: Optional[float] = None,
+                 max_rss_mb: Optional[float] = None, max_tasks_per_worker: Optional[int] = 50,
+                 poll_interval: float = 0.2):
+        """
+            Args:
+                processor (Any): The PDFProcessor sent to every worker.
+                max_workers (int): The number of worker processes.
+                timeout (Optional[float]): The wall-clock limit per file in seconds. Unlimited by default.
+                max_rss_mb (Optional[float]): The resident memory limit per worker in MiB. Unlimited by default;
+                                              ignored where the RSS cannot be read (no psutil and no /proc).
+                max_tasks_per_worker (Optional[int]): The number of files after which a worker is replaced.
+                                                      None keeps workers for the whole run.
+                poll_interval (float): How often the limits are checked, in seconds.
+        """
+        self.processor = processor
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024 if max_rss_mb else None
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.poll_interval = poll_interval
+        self.quarantine: List[Dict[str, Any]] = []
+        self._context = multiprocessing.get_context()
+
+    def _violation(self, worker: _Worker) -> Optional[str]:
+        elapsed = time.monotonic() - worker.started
+        if self.timeout and elapsed > self.timeout:
+            return f"超时（{elapsed:.1f} 秒）"
+        if self.max_rss_bytes:
+            rss = rss_bytes(worker.process.pid)
+            if rss is not None and rss > self.max_rss_bytes:
+                return f"内存超限（{rss / 1024 / 1024:.0f} MiB）"
+        return None
+
+    def _quarantine(self, worker: _Worker, reason: str) -> None:
+        elapsed = time.monotonic() - worker.started
+        self.quarantine.append({'file': worker.file_name, 'reason': reason, 'elapsed': round(elapsed, 3)})
+        print(f"已隔离文件 '{worker.file_name}': {reason}")
+
+    def run(self, input_dir: str, file_names: List[str]) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Processes files and yields each result as soon as it is ready.
+
+            Args:
+                input_dir (str): The directory containing the files.
+                file_names (List[str]): The file names to process.
+
+            Yields:
+                Tuple[str, Optional[Dict[str, Any]]]: The file name and the result of `process_file`. Files
+                that raise are reported and skipped; quarantined files are not yielded.
+        """
+        pending = deque(file_names)
+        workers = [_Worker(self._context, self.processor) for _ in range(min(self.max_workers, len(pending)))]
+        try:
+            while True:
+                for worker in workers:
+                    if worker.file_name is None and pending:
+                        file_name = pending.popleft()
+                        worker.assign(file_name, os.path.join(input_dir, file_name))
+                busy = [worker for worker in workers if worker.file_name is not None]
+                if not busy:
+                    break
+
+                ready = wait([worker.conn for worker in busy], timeout=self.poll_interval)
+                for worker in busy:
+                    replace = False
+                    if worker.conn in ready:
+                        try:
+                            ok, payload = worker.conn.recv()
+                        except (EOFError, OSError):
+                            worker.process.join()
+                            self._quarantine(worker, f"工作进程异常退出（exitcode {worker.process.exitcode}）")
+                            worker.stop(kill=True)
+                            replace = True
+                        else:
+                            file_name = worker.file_name
+                            worker.file_name = None
+                            worker.tasks += 1
+                            if ok:
+                                yield file_name, payload
+                            else:
+                                print(f"处理文件 '{file_name}' 时出错: {payload}")
+                            if self.max_tasks_per_worker and worker.tasks >= self.max_tasks_per_worker:
+                                worker.stop()
+                                replace = True
+                    else:
+                        reason = self._violation(worker)
+                        if reason:
+                            worker.stop(kill=True)
+                            self._quarantine(worker, reason)
+                            replace = True
+
+                    if replace:
+                        workers.remove(worker)
+                        if pending:
+                            workers.append(_Worker(self._context, self.processor))
+        finally:
+            for worker in workers:
+                worker.stop(kill=worker.file_name is not None)
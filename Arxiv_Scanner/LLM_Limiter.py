@@ -0,0 +1,67 @@
+import time
+import threading
+from typing import Dict, Optional
+
+from .Response_Cache import client_default_temperature
+
+
+class ConcurrencyLimitedLLM:
+    """
+    限制同时进行中的大模型请求数的客户端包装。
+
+    所有线程共享同一个信号量，超出上限的请求阻塞等待空位，因此无论有多少篇论文、多少个阶段和线程池
+    同时调用 ask，发往服务商的并发请求数都不超过 max_in_flight。
+    """
+
+    def __init__(self, llm, max_in_flight: int):
+        """
+        Args:
+            llm: 被包装的大模型客户端，提供 ask(prompt, temperature=...)。
+            max_in_flight (int): 同时进行中的请求数上限。
+        """
+        self.llm = llm
+        self.max_in_flight = max(1, max_in_flight)
+        self.default_temperature = client_default_temperature(llm)
+        self.counters = {'requests': 0, 'peak': 0, 'waited': 0.0}
+        self._in_flight = 0
+        self._semaphore = threading.BoundedSemaphore(self.max_in_flight)
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        # 除 ask 之外的属性（model、look、embed_text 等）直接转发给被包装的客户端
+        return getattr(self.llm, name)
+
+    def ask(self, prompt: str, temperature: Optional[float] = None) -> str:
+        """
+        等待空位后发送请求。
+
+        Args:
+            prompt (str): 提示词。
+            temperature (Optional[float]): 采样温度，默认使用客户端自身的默认值。
+
+        Returns:
+            str: 大模型的回复。
+        """
+        kwargs = {} if temperature is None else {'temperature': temperature}
+        start = time.monotonic()
+        with self._semaphore:
+            with self._lock:
+                self._in_flight += 1
+                self.counters['requests'] += 1
+                self.counters['peak'] = max(self.counters['peak'], self._in_flight)
+                self.counters['waited'] += time.monotonic() - start
+            try:
+                return self.llm.ask(prompt, **kwargs)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        返回计数器的副本。
+
+        Returns:
+            Dict[str, float]: {'requests', 'peak', 'waited', 'in_flight'}，peak 为观测到的最大并发请求数。
+        """
+        with self._lock:
+            return dict(self.counters, in_flight=self._in_flight)
@@ -1,9 +1,19 @@
 import re
 import os
 import json
-from typing import List, Dict, Optional, Any
+import time
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Dict, Optional, Set, TextIO, Tuple, Any
 
 import PyPDF2
+from watchdog.observers import Observer
+
+from .PDF_Store import PDFStore
+from .Extraction_Cache import ExtractionCache
+from .Extraction_Pool import GuardedPool
+from .Directory_Watcher import SettledFileHandler
 
 
 class PDFProcessor:
@@ -13,10 +23,23 @@ class PDFProcessor:
     content into a structured JSON format, including the character ranges of each section.
     """
 
+    # Bump when a change to the extraction code alters its output, to invalidate cached results
+    cache_version = 2
+    # stop_at_references ignores end-matter headings in the first fifth of a PDF (title page, table of contents)
+    end_matter_min_fraction = 0.2
+
     def __init__(
         self,
         translations: Optional[Dict[str, List[str]]] = None,
-        chapters: Optional[Dict[str, List[str]]] = None
+        chapters: Optional[Dict[str, List[str]]] = None,
+        cache_path: Optional[str] = None,
+        cache_max_bytes: int = 512 * 1024 * 1024,
+        compact: bool = False,
+        stop_at_references: bool = False,
+        max_pages: Optional[int] = None,
+        file_timeout: Optional[float] = None,
+        max_rss_mb: Optional[float] = None,
+        quarantine_path: Optional[str] = None
     ):
         """
         Initializes the PDFProcessor with translation mappings and chapter definitions.
@@ -27,6 +50,25 @@ class PDFProcessor:
                                                               their possible Chinese equivalents.
                 chapters (Optional[Dict[str, List[str]]]): A dictionary mapping standard chapter names to their
                                                          possible aliases in English.
+                cache_path (Optional[str]): The path to an SQLite extraction cache. Unchanged files are then
+                                            served from the cache by `process_directory_to_json`. Disabled by default.
+                cache_max_bytes (int): The size cap of the extraction cache in bytes. Defaults to 512 MiB.
+                compact (bool): Whether `process_pdf` and `process_txt` return compact records that store the
+                                normalized text once, {'text': ..., 'offsets': {chapter: {start, end, length}}},
+                                instead of one text copy per chapter. See `CompactSections`.
+                stop_at_references (bool): Whether PDF extraction stops after the page on which a References or
+                                           Appendices heading line appears. The heading only counts after a body
+                                           chapter heading and past `end_matter_min_fraction` of the pages, so a
+                                           table of contents does not end extraction. The kept part of that page
+                                           still forms the References/Appendices chapter. Disabled by default.
+                max_pages (Optional[int]): The maximum number of PDF pages to parse. Unlimited by default.
+                file_timeout (Optional[float]): The wall-clock limit in seconds for processing one file in
+                                                `process_directory_to_json`. Unlimited by default.
+                max_rss_mb (Optional[float]): The resident memory limit in MiB of a worker processing one file.
+                                              Unlimited by default. With either limit set, files are processed in
+                                              guarded worker processes that are killed and replaced on a violation.
+                quarantine_path (Optional[str]): A JSON Lines file where files that violated a limit are recorded
+                                                  with the reason. Unchanged files listed there are skipped later.
         """
         # Define default translations if none provided
         if translations is None:
@@ -102,6 +144,174 @@ class PDFProcessor:
         # Flatten the list of all possible section titles for easy searching
         self.section_titles = [title for titles in self.normalized_chapters.values() for title in titles]
 
+        # Precompile the section heading matchers used by filter_iclr_pdf
+        self.section_patterns, self.section_scanner = self.compile_section_patterns(self.normalized_chapters)
+
+        # Precompile the Chinese header detector and replacer used by translate
+        self._compile_translations()
+
+        self.compact = compact
+
+        # Early exit: a References/Appendices heading on a line of its own ends PDF extraction
+        self.stop_at_references = stop_at_references
+        self.max_pages = max_pages
+        self.end_matter_pattern = self.compile_end_matter_pattern()
+        self.body_heading_pattern = self.compile_body_heading_pattern()
+
+        # Per-file limits for directory processing; files that violate them are quarantined
+        self.file_timeout = file_timeout
+        self.max_rss_mb = max_rss_mb
+        self.quarantine_path = quarantine_path
+        self.quarantine: List[Dict[str, Any]] = []
+
+        # Cached results are only reused by a processor with the same chapters, translations and output options
+        self.config_fingerprint = self.fingerprint(
+            self.chapters, self.translations, compact=self.compact,
+            stop_at_references=self.stop_at_references, max_pages=self.max_pages
+        )
+        self.cache = ExtractionCache(cache_path, cache_max_bytes) if cache_path else None
+
+    @classmethod
+    def fingerprint(cls, chapters: Dict[str, List[str]], translations: Dict[str, List[str]],
+                    **options: Any) -> str:
+        """
+        Computes a fingerprint of the processor configuration used to key the extraction cache.
+
+            Args:
+                chapters (Dict[str, List[str]]): The chapter definitions.
+                translations (Dict[str, List[str]]): The translation mappings.
+                **options (Any): Other settings that change the output, such as compact or max_pages.
+
+            Returns:
+                str: A hexadecimal sha256 digest.
+        """
+        config = json.dumps(
+            {'version': cls.cache_version, 'chapters': chapters, 'translations': translations, 'options': options},
+            ensure_ascii=False, sort_keys=True
+        )
+        return hashlib.sha256(config.encode('utf-8')).hexdigest()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The cache connection stays in the parent process; pool workers only run the extraction
+        state = self.__dict__.copy()
+        state['cache'] = None
+        return state
+
+    @staticmethod
+    def compile_section_patterns(normalized_chapters: Dict[str, List[str]]) -> tuple:
+        """
+        Compiles one heading pattern per section, matching any of its aliases with optional numbering before
+        the title, and a zero-width scanner that stops at every position where any alias matches.
+
+            Args:
+                normalized_chapters (Dict[str, List[str]]): A dictionary mapping chapter names to normalized aliases.
+
+            Returns:
+                tuple: (section_patterns, section_scanner), where section_patterns maps each chapter name to
+                its compiled pattern.
+        """
+        def heading(titles: List[str]) -> str:
+            # Using word boundaries and allowing possible numbering before titles
+            return r'(?:(?:\d+\.)*\d+\s+)?\b(?:' + '|'.join(re.escape(t) for t in titles) + r')\b'
+
+        section_patterns = {
+            section: re.compile(heading(titles), re.IGNORECASE)
+            for section, titles in normalized_chapters.items() if titles
+        }
+        all_titles = [title for titles in normalized_chapters.values() for title in titles if title]
+        # Cheaply reject positions that cannot start a heading before trying the alternation
+        first_chars = ''.join(sorted({re.escape(title[0]) for title in all_titles}))
+        section_scanner = re.compile(r'(?=[\d' + first_chars + '])(?=' + heading(all_titles) + ')', re.IGNORECASE)
+        return section_patterns, section_scanner
+
+    def _compile_translations(self) -> None:
+        # Detection counts (section, title) pairs, so a title listed under two sections counts twice
+        self.translation_weights = {}
+        self.translation_titles_by_char = {}
+        for chinese_titles in self.translations.values():
+            for ch_title in chinese_titles:
+                if ch_title not in self.translation_weights:
+                    self.translation_titles_by_char.setdefault(ch_title[:1], []).append(ch_title)
+                self.translation_weights[ch_title] = self.translation_weights.get(ch_title, 0) + 1
+        first_chars = ''.join(re.escape(char) for char in self.translation_titles_by_char if char)
+        self.translation_scanner = re.compile('[' + first_chars + ']' if first_chars else '(?!)')
+
+        # One capturing group per (section, title) in mapping order, so the first listed title wins
+        self.translation_targets = []
+        alternatives = []
+        for eng, chinese_titles in self.translations.items():
+            for ch_title in chinese_titles:
+                self.translation_targets.append(f'\n{eng}\n')
+                alternatives.append('(' + re.escape(ch_title) + ')')
+        self.translation_pattern = re.compile(r'\b(?:' + '|'.join(alternatives) + r')\b', re.IGNORECASE)
+
+        # A single substitution only equals replacing each title in turn when titles are whole words and
+        # no title occurs in the English replacements; otherwise translate keeps the sequential replacement
+        self.translation_single_pass = (
+            all(re.fullmatch(r'\w+', ch_title) for ch_title in self.translation_weights)
+            and not self.translation_pattern.search('\n'.join(self.translations))
+        )
+
+    def compile_end_matter_pattern(self) -> re.Pattern:
+        """
+        Compiles the pattern of a References or Appendices heading standing on a line of its own, such as
+        "References", "7 REFERENCES", "Appendix A" or "参考文献". Running text that merely mentions references
+        does not match, and neither does a table-of-contents entry such as "References 9".
+
+            Returns:
+                re.Pattern: The compiled pattern.
+        """
+        titles = [
+            title for section, aliases in self.normalized_chapters.items()
+            if section.lower() in ('references', 'appendices') for title in aliases
+        ]
+        titles += self.translations.get('references', []) + self.translations.get('appendices', [])
+        return self._heading_line_pattern(titles)
+
+    def compile_body_heading_pattern(self) -> re.Pattern:
+        """
+        Compiles the pattern of a body chapter heading (Introduction, Methodology, ..., Conclusion, or a
+        Chinese equivalent) standing on a line of its own. Front matter (Abstract) and end matter
+        (Acknowledgments, References, Appendices) are not body chapters.
+
+            Returns:
+                re.Pattern: The compiled pattern.
+        """
+        excluded = ('abstract', 'acknowledgments', 'references', 'appendices')
+        titles = [
+            title for section, aliases in self.normalized_chapters.items()
+            if section.lower() not in excluded for title in aliases
+        ]
+        titles += [
+            title for section, aliases in self.translations.items()
+            if section.lower() not in excluded for title in aliases
+        ]
+        return self._heading_line_pattern(titles)
+
+    @staticmethod
+    def _heading_line_pattern(titles: List[str]) -> re.Pattern:
+        # A heading line: an optional "3.", "3.1" or "第三章" number, the title, an optional appendix letter
+        # ("Appendix A", "附录A"). A trailing page number, as in a table of contents, does not match.
+        titles = [title for title in titles if title]
+        if not titles:
+            return re.compile('(?!)')
+        return re.compile(
+            r'^[ \t]*(?:(?:\d+\.)*\d+\.?[ \t]+|第[\d一二三四五六七八九十]+章[ \t]*)?'
+            r'(?:' + '|'.join(re.escape(t) for t in sorted(set(titles), key=len, reverse=True)) + r')'
+            r'(?:[ \t]*(?-i:[A-Z]))?[ \t]*[.:]?[ \t]*$',
+            re.IGNORECASE | re.MULTILINE
+        )
+
+    def _ends_body(self, page_text: str, page_number: int, num_pages: int, body_seen: bool) -> bool:
+        # An end-matter heading only ends extraction once a body chapter heading has appeared before it and
+        # enough of the document has been read, so a table of contents near the front never triggers it
+        if page_number < num_pages * self.end_matter_min_fraction:
+            return False
+        for match in self.end_matter_pattern.finditer(page_text):
+            if body_seen or self.body_heading_pattern.search(page_text, 0, match.start()):
+                return True
+        return False
+
     @staticmethod
     def normalize_title(title: str) -> str:
         """
@@ -139,34 +349,122 @@ class PDFProcessor:
             Returns:
                 str: The translated content if Chinese is detected; otherwise, the original content.
         """
-        cnt = 0
-        for k, vs in self.translations.items():
-            for v in vs:
-                if v in content:
-                    cnt += 1
+        # Count the listed titles occurring in the content, stopping as soon as three are found
+        cnt = self.translation_weights.get('', 0)
+        found = set()
+        for match in self.translation_scanner.finditer(content):
+            pos = match.start()
+            for ch_title in self.translation_titles_by_char[match.group()]:
+                if ch_title not in found and content.startswith(ch_title, pos):
+                    found.add(ch_title)
+                    cnt += self.translation_weights[ch_title]
+            if cnt >= 3:
+                break
         if cnt < 3:
             return content
 
         print("检测到中文章节标题，正在翻译...")
 
-        # Remove content after specific Chinese sections
+        # Remove content after specific Chinese sections; end marks the kept prefix so nothing is copied
+        end = len(content)
         for v in ["表格索引", "插图索引"]:
-            if v in content[len(content) // 2:]:
-                content = content[:content.rindex(v, len(content) // 2)]
+            pos = content.rfind(v, end // 2, end)
+            if pos != -1:
+                end = pos
 
         for section in ["acknowledgments", "appendices", "references"]:
             for v in self.translations.get(section, []):
-                if v in content[len(content) // 2:]:
-                    content = content[:content.rindex(v, len(content) // 2)]
+                pos = content.rfind(v, end // 2, end)
+                if pos != -1:
+                    end = pos
                     break
+        content = content[:end]
 
         # Replace Chinese section headers with English equivalents
+        if self.translation_single_pass:
+            return self.translation_pattern.sub(lambda m: self.translation_targets[m.lastindex - 1], content)
         for eng, chinese_titles in self.translations.items():
             for ch_title in chinese_titles:
                 pattern = re.compile(r'\b' + re.escape(ch_title) + r'\b', re.IGNORECASE)
                 content = pattern.sub(f'\n{eng}\n', content)
         return content
 
+    @staticmethod
+    def _open_pdf(pdf_path: str) -> Optional[PyPDF2.PdfReader]:
+        try:
+            return PyPDF2.PdfReader(pdf_path)
+        except Exception as e:
+            print(f"无法读取PDF文件 '{pdf_path}': {e}")
+            return None
+
+    @staticmethod
+    def _iter_reader_pages(pdf_reader: PyPDF2.PdfReader, num_pages: int) -> Iterator[str]:
+        for page_number in range(num_pages):
+            try:
+                yield pdf_reader.pages[page_number].extract_text() or ""
+            except Exception as e:
+                print(f"读取页面 {page_number + 1} 时出错: {e}")
+                yield ""
+
+    def iter_pages(self, pdf_path: str) -> Iterator[str]:
+        """
+        Lazily extracts the text of a PDF file one page at a time.
+
+        Pages are only parsed when the caller asks for them, so a consumer that stops iterating early
+        never pays for the remaining pages.
+
+            Args:
+                pdf_path (str): The path to the PDF file.
+
+            Yields:
+                str: The text of each page in order, or an empty string for a page without text or one
+                that could not be read.
+        """
+        pdf_reader = self._open_pdf(pdf_path)
+        if pdf_reader is not None:
+            yield from self._iter_reader_pages(pdf_reader, len(pdf_reader.pages))
+
+    def extract_pages(self, pdf_path: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Extracts text from a PDF file, honouring max_pages and stop_at_references, and reports which pages
+        were left unparsed.
+
+            Args:
+                pdf_path (str): The path to the PDF file.
+
+            Returns:
+                Tuple[str, Dict[str, Any]]: The extracted text, and a report with the total page count
+                ('total'), the number of parsed pages ('parsed'), the 1-based numbers of the skipped pages
+                ('skipped') and why extraction stopped early ('stop': 'references', 'max_pages' or None).
+        """
+        pdf_reader = self._open_pdf(pdf_path)
+        num_pages = len(pdf_reader.pages) if pdf_reader is not None else 0
+        limit = min(num_pages, self.max_pages) if self.max_pages else num_pages
+        stop = 'max_pages' if limit < num_pages else None
+
+        page_texts = []
+        parsed = 0
+        if pdf_reader is not None:
+            body_seen = False
+            for page_text in self._iter_reader_pages(pdf_reader, limit):
+                parsed += 1
+                if page_text:
+                    page_texts.append(page_text + "\n")
+                if self.stop_at_references and parsed < num_pages and page_text:
+                    if self._ends_body(page_text, parsed, num_pages, body_seen):
+                        stop = 'references'
+                        break
+                    body_seen = body_seen or bool(self.body_heading_pattern.search(page_text))
+
+        report = {
+            'total': num_pages,
+            'parsed': parsed,
+            'skipped': list(range(parsed + 1, num_pages + 1)),
+            'stop': stop,
+        }
+        # Join once at the end instead of growing one string page by page
+        return "".join(page_texts), report
+
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """
         Extracts text from a PDF file.
@@ -177,66 +475,56 @@ class PDFProcessor:
             Returns:
                 str: The extracted text from the PDF.
         """
-        try:
-            pdf_reader = PyPDF2.PdfReader(pdf_path)
-        except Exception as e:
-            print(f"无法读取PDF文件 '{pdf_path}': {e}")
-            return ""
+        return self.extract_pages(pdf_path)[0]
 
-        num_pages = len(pdf_reader.pages)
-        extracted_text = ""
+    def find_sections(self, content: str) -> List[Dict[str, Any]]:
+        """
+        Finds the first occurrence of every chapter in a single pass over the content.
 
-        for page_number in range(num_pages):
-            try:
-                page = pdf_reader.pages[page_number]
-                page_text = page.extract_text()
-                if page_text:
-                    extracted_text += page_text + "\n"
-            except Exception as e:
-                print(f"读取页面 {page_number + 1} 时出错: {e}")
+        The scanner is zero-width, so overlapping headings are all seen; a chapter starts at the leftmost
+        match of any of its aliases, including numbering before the title.
 
-        return extracted_text
+            Args:
+                content (str): The text content to search.
 
-    def filter_iclr_pdf(self, content: str) -> List[Dict[str, Any]]:
+            Returns:
+                List[Dict[str, Any]]: A list of dictionaries with chapter name and start, in chapter definition order.
         """
-        Filters the PDF content to extract only the specified chapters, along with their ranges.
+        first_match = {}
+        for match in self.section_scanner.finditer(content):
+            start_pos = match.start()
+            for section, pattern in self.section_patterns.items():
+                if section not in first_match and pattern.match(content, start_pos):
+                    first_match[section] = start_pos
+            if len(first_match) == len(self.section_patterns):
+                break
+
+        return [
+            {'section': section, 'start': first_match[section]}
+            for section in self.normalized_chapters if section in first_match
+        ]
+
+    def split_sections(self, content: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Translates the content and locates the specified chapters without copying their text.
 
             Args:
                 content (str): The full text content of the PDF.
 
             Returns:
-                List[Dict[str, Any]]: A list of dictionaries, each containing chapter name, text, start, and end.
+                Tuple[str, List[Dict[str, Any]]]: The translated content, and a list of dictionaries with chapter
+                name, start, end and the length of the stripped chapter text, sorted by start.
         """
         content = self.translate(content)
-        paper_sections = []
-
-        # Find all matches for chapter titles
-        for section, titles in self.normalized_chapters.items():
-            for title in titles:
-                # Using word boundaries and allowing possible numbering before titles
-                pattern = re.compile(r'(?:(?:\d+\.)*\d+\s+)?\b' + re.escape(title) + r'\b', re.IGNORECASE)
-                for match in pattern.finditer(content):
-                    start_pos = match.start()
-                    paper_sections.append({
-                        'section': section,
-                        'start': start_pos
-                    })
-                    break  # Only consider the first occurrence of the title
+
+        paper_sections = self.find_sections(content)
 
         if not paper_sections:
             print("未找到任何章节标题。")
-            return []
-
-        # Sort sections by their start positions
-        paper_sections = sorted(paper_sections, key=lambda x: x['start'])
+            return content, []
 
-        # Remove duplicates: in case multiple titles map to the same section
-        unique_sections = []
-        seen = set()
-        for sec in paper_sections:
-            if sec['section'] not in seen:
-                unique_sections.append(sec)
-                seen.add(sec['section'])
+        # Sort sections by their start positions; each section appears once even if several titles map to it
+        unique_sections = sorted(paper_sections, key=lambda x: x['start'])
 
         # Assign end positions
         for i in range(len(unique_sections)):
@@ -246,52 +534,77 @@ class PDFProcessor:
                 end = unique_sections[i + 1]['start']
             else:
                 end = len(content)
-            extracted_text = content[start:end].strip()
             current_section['end'] = end
-            current_section['length'] = len(extracted_text)
-            current_section['text'] = extracted_text
+            current_section['length'] = len(content[start:end].strip())
 
-        return unique_sections
+        return content, unique_sections
 
-    def process_pdf(self, pdf_path: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    def filter_iclr_pdf(self, content: str) -> List[Dict[str, Any]]:
         """
-        Processes a single PDF file to extract and filter its chapters, including their ranges.
+        Filters the PDF content to extract only the specified chapters, along with their ranges.
 
             Args:
-                pdf_path (str): The path to the PDF file.
+                content (str): The full text content of the PDF.
 
             Returns:
-                Optional[Dict[str, Dict[str, Any]]]: A dictionary mapping chapter names to their extracted text and ranges.
-                Returns None if processing fails.
+                List[Dict[str, Any]]: A list of dictionaries, each containing chapter name, text, start, and end.
         """
-        extracted_text = self.extract_text_from_pdf(pdf_path)
-        if not extracted_text:
-            return None
-
-        print(f"Processing '{os.path.basename(pdf_path)}'...")
+        content, unique_sections = self.split_sections(content)
+        for sec in unique_sections:
+            sec['text'] = content[sec['start']:sec['end']].strip()
+        return unique_sections
 
+    def _sections_from_text(self, extracted_text: str) -> Optional[Dict[str, Any]]:
         # Optional: Clean specific formatting issues
         extracted_text = extracted_text.replace("I NTRODUCTION", "INTRODUCTION")
         extracted_text = extracted_text.replace("C ONCLUSION", "CONCLUSION")
 
-        split_sections = self.filter_iclr_pdf(extracted_text)
+        content, split_sections = self.split_sections(extracted_text)
         if not split_sections:
             return None
 
+        offsets = {
+            sec['section']: {'start': sec['start'], 'end': sec['end'], 'length': sec['length']}
+            for sec in split_sections
+        }
+        if self.compact:
+            return {'text': content, 'offsets': offsets}
+
         # Organize sections into a dictionary
         section_dict = {}
-        for sec in split_sections:
-            section_name = sec['section']
-            section_dict[section_name] = {
-                'text': sec['text'],
-                'start': sec['start'],
-                'end': sec['end'],
-                'length': sec['length']
-            }
-
+        for section_name, offset in offsets.items():
+            section_dict[section_name] = {'text': content[offset['start']:offset['end']].strip(), **offset}
         return section_dict
-    
-    def process_txt(self, txt_path: str) -> Optional[Dict[str, Dict[str, Any]]]:
+
+    def process_pdf(self, pdf_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Processes a single PDF file to extract and filter its chapters, including their ranges.
+
+            Args:
+                pdf_path (str): The path to the PDF file.
+
+            Returns:
+                Optional[Dict[str, Any]]: A dictionary mapping chapter names to their extracted text and ranges,
+                or a compact record if the processor was created with compact=True. With stop_at_references
+                or max_pages set, the page report of `extract_pages` is added under the '_pages' key.
+                Returns None if processing fails.
+        """
+        extracted_text, pages = self.extract_pages(pdf_path)
+        if not extracted_text:
+            return None
+
+        print(f"Processing '{os.path.basename(pdf_path)}'...")
+        section_data = self._sections_from_text(extracted_text)
+        if section_data is None or not (self.stop_at_references or self.max_pages):
+            return section_data
+
+        if pages['skipped']:
+            reason = "参考文献/附录" if pages['stop'] == 'references' else "页数上限"
+            print(f"已跳过第 {pages['skipped'][0]}-{pages['skipped'][-1]} 页（{reason}）。")
+        section_data['_pages'] = pages
+        return section_data
+
+    def process_txt(self, txt_path: str) -> Optional[Dict[str, Any]]:
         """
         Processes a single text file to extract and filter its chapters, including their ranges.
 
@@ -299,7 +612,8 @@ class PDFProcessor:
                 txt_path (str): The path to the text file.
 
             Returns:
-                Optional[Dict[str, Dict[str, Any]]]: A dictionary mapping chapter names to their extracted text and ranges.
+                Optional[Dict[str, Any]]: A dictionary mapping chapter names to their extracted text and ranges,
+                or a compact record if the processor was created with compact=True.
                 Returns None if processing fails.
         """
         with open(txt_path, 'r', encoding='utf-8') as file:
@@ -308,60 +622,205 @@ class PDFProcessor:
             return None
 
         print(f"Processing '{os.path.basename(txt_path)}'...")
+        return self._sections_from_text(extracted_text)
 
-        # Optional: Clean specific formatting issues
-        extracted_text = extracted_text.replace("I NTRODUCTION", "INTRODUCTION")
-        extracted_text = extracted_text.replace("C ONCLUSION", "CONCLUSION")
+    def process_file(self, file_path: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Processes a single PDF or TXT file, choosing the handler by file extension.
 
-        split_sections = self.filter_iclr_pdf(extracted_text)
-        if not split_sections:
-            return None
+            Args:
+                file_path (str): The path to the PDF or TXT file.
 
-        # Organize sections into a dictionary
-        section_dict = {}
-        for sec in split_sections:
-            section_name = sec['section']
-            section_dict[section_name] = {
-                'text': sec['text'],
-                'start': sec['start'],
-                'end': sec['end'],
-                'length': sec['length']
+            Returns:
+                Optional[Dict[str, Dict[str, Any]]]: The section dictionary produced by `process_pdf` or `process_txt`.
+                Returns None for unsupported file types or if processing fails.
+        """
+        if file_path.lower().endswith('.pdf'):
+            return self.process_pdf(file_path)
+        if file_path.lower().endswith('.txt'):
+            return self.process_txt(file_path)
+        return None
+
+    def iter_directory(self, input_dir: str, max_workers: int = 1, skip: Iterable[str] = (),
+                       file_names: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, Dict[str, Dict[str, Any]]]]:
+        """
+        Processes all PDF and TXT files in a directory and yields each result as soon as it is ready.
+
+        With max_workers > 1 the files are processed in a process pool, since PyPDF2 text extraction is
+        CPU-bound pure Python, and results are yielded in completion order; otherwise files are processed
+        in sorted file-name order. A file that raises or yields no sections is reported and skipped.
+        If an extraction cache is configured, unchanged files are read from it and only the rest are processed.
+        If file_timeout or max_rss_mb is set, files are processed in guarded worker processes (even with
+        max_workers=1); files that violate a limit are added to `quarantine` and skipped.
+
+            Args:
+                input_dir (str): The path to the directory containing PDF and TXT files.
+                max_workers (int): The number of worker processes. 1 processes files sequentially in this process.
+                skip (Iterable[str]): File names that should not be processed.
+                file_names (Optional[Iterable[str]]): Only process these files instead of the whole directory.
+
+            Yields:
+                Tuple[str, Dict[str, Dict[str, Any]]]: The file name and its section dictionary.
+        """
+        skip = set(skip)
+        quarantined = self.quarantined_names(input_dir)
+        if quarantined:
+            print(f"跳过 {len(quarantined)} 个已隔离的文件。")
+            skip |= quarantined
+        file_names = sorted(
+            file_name for file_name in (os.listdir(input_dir) if file_names is None else file_names)
+            if file_name.lower().endswith(('.pdf', '.txt')) and file_name not in skip  # 跳过不支持的文件类型
+        )
+
+        # 命中缓存的文件直接使用缓存结果
+        hits = 0
+        pending = []
+        for file_name in file_names:
+            if self.cache is not None:
+                hit, section_data = self.cache.get(os.path.join(input_dir, file_name), self.config_fingerprint)
+                if hit:
+                    hits += 1
+                    if section_data:
+                        yield file_name, section_data
+                    else:
+                        print(f"未能处理文件 '{file_name}'。")
+                    continue
+            pending.append(file_name)
+
+        for file_name, section_data in self._iter_processed(input_dir, pending, max_workers):
+            if self.cache is not None:
+                self.cache.put(os.path.join(input_dir, file_name), self.config_fingerprint, section_data)
+            if section_data:
+                yield file_name, section_data
+            else:
+                print(f"未能处理文件 '{file_name}'。")
+
+        if self.cache is not None:
+            print(f"提取缓存: 命中 {hits}，未命中 {len(pending)}。")
+
+    def _iter_processed(self, input_dir: str, file_names: List[str],
+                        max_workers: int) -> Iterator[Tuple[str, Optional[Dict[str, Dict[str, Any]]]]]:
+        if (self.file_timeout or self.max_rss_mb) and file_names:
+            pool = GuardedPool(self, max_workers, timeout=self.file_timeout, max_rss_mb=self.max_rss_mb)
+            try:
+                yield from pool.run(input_dir, file_names)
+            finally:
+                self._record_quarantine(input_dir, pool.quarantine)
+            return
+
+        if max_workers <= 1 or not file_names:
+            for file_name in file_names:
+                try:
+                    section_data = self.process_file(os.path.join(input_dir, file_name))
+                except Exception as e:
+                    print(f"处理文件 '{file_name}' 时出错: {e}")
+                    continue
+                yield file_name, section_data
+            return
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.process_file, os.path.join(input_dir, file_name)): file_name
+                for file_name in file_names
             }
+            try:
+                for future in as_completed(futures):
+                    try:
+                        section_data = future.result()
+                    except Exception as e:
+                        print(f"处理文件 '{futures[future]}' 时出错: {e}")
+                        continue
+                    yield futures[future], section_data
+            finally:
+                executor.shutdown(cancel_futures=True)
+
+    def _record_quarantine(self, input_dir: str, entries: List[Dict[str, Any]]) -> None:
+        for entry in entries:
+            file_path = os.path.join(input_dir, entry['file'])
+            if os.path.exists(file_path):
+                stat = os.stat(file_path)
+                entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            entry['time'] = time.time()
+            self.quarantine.append(entry)
+        if self.quarantine_path and entries:
+            with open(self.quarantine_path, 'a', encoding='utf-8') as quarantine_file:
+                for entry in entries:
+                    quarantine_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def quarantined_names(self, input_dir: str) -> Set[str]:
+        """
+        Reads the quarantine file and returns the files in a directory that are still quarantined, i.e. whose
+        size and modification time have not changed since they were recorded.
 
-        return section_dict
-        
-    def process_directory_to_json(self, input_dir: str, output_json_path: str = 'output.json') -> None:
+            Args:
+                input_dir (str): The path to the directory containing PDF and TXT files.
+
+            Returns:
+                Set[str]: The quarantined file names.
+        """
+        names = set()
+        if not self.quarantine_path or not os.path.exists(self.quarantine_path):
+            return names
+        with open(self.quarantine_path, 'r', encoding='utf-8') as quarantine_file:
+            for line in quarantine_file:
+                try:
+                    entry = json.loads(line)
+                    stat = os.stat(os.path.join(input_dir, entry['file']))
+                except (ValueError, KeyError, TypeError, OSError):
+                    continue
+                if entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+                    names.add(entry['file'])
+        return names
+
+    @staticmethod
+    def read_jsonl_names(jsonl_path: str) -> Set[str]:
+        """
+        Reads the file names already recorded in a JSONL output file. A truncated last line left by an
+        interrupted run is ignored, so that file is processed again; it may end inside a multi-byte
+        UTF-8 character, so undecodable bytes are replaced rather than raising.
+
+            Args:
+                jsonl_path (str): The path to the JSONL file.
+
+            Returns:
+                Set[str]: The recorded file names, empty if the file does not exist.
+        """
+        names = set()
+        if not os.path.exists(jsonl_path):
+            return names
+        with open(jsonl_path, 'r', encoding='utf-8', errors='replace') as jsonl_file:
+            for line in jsonl_file:
+                try:
+                    names.add(json.loads(line)['file'])
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return names
+
+    def process_directory_to_json(self, input_dir: str, output_json_path: str = 'output.json',
+                                  max_workers: int = 1, stream: bool = False) -> None:
         """
         Processes all PDF and TXT files in a specified directory and writes the extracted information to a JSON file.
 
+        By default all results are collected and written once, keyed by file name in sorted order. With
+        stream=True each paper is instead appended as one compact JSON line, {"file": ..., "sections": ...},
+        as soon as it is processed, so memory does not grow with the corpus and an interrupted run keeps
+        everything written so far; papers already present in the file are skipped on a rerun.
+
             Args:
                 input_dir (str): The path to the directory containing PDF and TXT files.
-                output_json_path (str): The path where the JSON output will be saved.
+                output_json_path (str): The path where the JSON (or JSONL when streaming) output will be saved.
+                max_workers (int): The number of worker processes. 1 processes files sequentially in this process.
+                stream (bool): Whether to append JSON Lines records instead of writing one JSON document.
         """
         if not os.path.isdir(input_dir):
             print(f"目录 '{input_dir}' 不存在。")
             return
 
-        result = {}
-
-        for file_name in os.listdir(input_dir):
-            file_path = os.path.join(input_dir, file_name)
-            if not os.path.exists(file_path):
-                print(f"文件 '{file_path}' 不存在。")
-                continue
-
-            # 根据文件扩展名选择相应的处理方法
-            if file_name.lower().endswith('.pdf'):
-                section_data = self.process_pdf(file_path)
-            elif file_name.lower().endswith('.txt'):
-                section_data = self.process_txt(file_path)
-            else:
-                continue  # 跳过不支持的文件类型
+        if stream:
+            self._stream_directory_to_jsonl(input_dir, output_json_path, max_workers)
+            return
 
-            if section_data:
-                result[file_name] = section_data
-            else:
-                print(f"未能处理文件 '{file_name}'。")
+        result = dict(sorted(self.iter_directory(input_dir, max_workers)))
 
         # Write the result to a JSON file
         try:
@@ -370,3 +829,119 @@ class PDFProcessor:
             print(f"已成功将结果保存到 '{output_json_path}'。")
         except Exception as e:
             print(f"写入JSON文件时出错: {e}")
+
+    @staticmethod
+    def _repair_jsonl_tail(jsonl_path: str, chunk_size: int = 64 * 1024) -> None:
+        # 上次运行中断时最后一行可能不完整，甚至截断在多字节UTF-8字符中间，因此按字节处理：
+        # 完整的记录只补上换行，不完整的记录截去（该文件下次会重新处理）
+        with open(jsonl_path, 'rb+') as raw:
+            end = raw.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - chunk_size)
+                raw.seek(start)
+                newline = raw.read(position - start).rfind(b'\n')
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position == end:
+                return
+            raw.seek(position)
+            tail = raw.read()
+            try:
+                json.loads(tail.decode('utf-8'))['file']
+            except (ValueError, KeyError, TypeError):
+                raw.truncate(position)
+            else:
+                raw.write(b'\n')
+
+    @classmethod
+    def _open_jsonl(cls, jsonl_path: str) -> TextIO:
+        if os.path.exists(jsonl_path):
+            cls._repair_jsonl_tail(jsonl_path)
+        return open(jsonl_path, 'a', encoding='utf-8')
+
+    @staticmethod
+    def _append_jsonl(jsonl_file: TextIO, file_name: str, section_data: Dict[str, Any]) -> None:
+        record = {'file': file_name, 'sections': section_data}
+        jsonl_file.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+        jsonl_file.flush()
+
+    def _stream_directory_to_jsonl(self, input_dir: str, output_jsonl_path: str, max_workers: int) -> None:
+        done = self.read_jsonl_names(output_jsonl_path)
+        if done:
+            print(f"跳过已写入 '{output_jsonl_path}' 的 {len(done)} 个文件。")
+
+        written = 0
+        try:
+            with self._open_jsonl(output_jsonl_path) as jsonl_file:
+                for file_name, section_data in self.iter_directory(input_dir, max_workers, skip=done):
+                    self._append_jsonl(jsonl_file, file_name, section_data)
+                    written += 1
+            print(f"已成功将 {written} 个文件的结果追加到 '{output_jsonl_path}'。")
+        except Exception as e:
+            print(f"写入JSONL文件时出错: {e}")
+
+    def watch_directory(self, input_dir: str, output_jsonl_path: str, debounce: float = 2.0,
+                        poll_interval: float = 0.5, max_workers: int = 1,
+                        stop_event: Optional[threading.Event] = None) -> None:
+        """
+        Watches a directory and extracts every PDF or TXT file as soon as it has finished landing, appending
+        one record per paper to a JSON Lines file in the `process_directory_to_json(stream=True)` format.
+
+        Files already in the directory but not yet in the output are processed first. A new file is only
+        processed once it has produced no file-system events for `debounce` seconds, and a PDF must also end
+        with its %%EOF marker, so files still being written and ArxivDownloader's ".part" files are ignored.
+        Runs until stop_event is set or the process is interrupted.
+
+            Args:
+                input_dir (str): The path to the directory to watch, typically ArxivDownloader's download_dir.
+                output_jsonl_path (str): The JSON Lines file to append to.
+                debounce (float): How long a file must stay quiet before it is processed, in seconds.
+                poll_interval (float): How often settled files are collected, in seconds.
+                max_workers (int): The number of worker processes for the initial catch-up.
+                stop_event (Optional[threading.Event]): Stops the watcher when set.
+        """
+        if not os.path.isdir(input_dir):
+            print(f"目录 '{input_dir}' 不存在。")
+            return
+
+        done = self.read_jsonl_names(output_jsonl_path)
+        handler = SettledFileHandler()
+        observer = Observer()
+        observer.schedule(handler, input_dir, recursive=False)
+        observer.start()
+        print(f"开始监视目录 '{input_dir}'...")
+
+        try:
+            with self._open_jsonl(output_jsonl_path) as jsonl_file:
+                # 先处理监视开始前已下载完成的文件
+                for file_name, section_data in self.iter_directory(input_dir, max_workers, skip=done):
+                    self._append_jsonl(jsonl_file, file_name, section_data)
+                    done.add(file_name)
+
+                while stop_event is None or not stop_event.is_set():
+                    time.sleep(poll_interval)
+                    ready = []
+                    for file_path in handler.settled(debounce):
+                        file_name = os.path.basename(file_path)
+                        if file_name in done:
+                            continue
+                        if file_name.lower().endswith('.pdf') and not PDFStore.is_complete_pdf(file_path):
+                            print(f"文件 '{file_name}' 尚未写入完整，等待后续事件。")
+                            continue
+                        ready.append(file_name)
+                    if not ready:
+                        continue
+
+                    for file_name, section_data in self.iter_directory(input_dir, file_names=ready):
+                        self._append_jsonl(jsonl_file, file_name, section_data)
+                        done.add(file_name)
+                        print(f"已提取新文件 '{file_name}'。")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            observer.stop()
+            observer.join()
+            print(f"已停止监视目录 '{input_dir}'。")
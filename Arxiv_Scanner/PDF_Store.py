@@ -0,0 +1,158 @@
+import os
+import shutil
+from typing import Iterator, List
+
+from .Paper_Catalog import PaperCatalog
+
+
+class PDFStore:
+    """
+    以 sha256 寻址的PDF存储。
+
+    每个文件按内容摘要保存为 "objects/ab/cd/<sha256>.pdf"，相同内容只保存一份，
+    两级分片使单个目录中的文件数保持在可控范围。arXiv ID 到摘要的映射记录在 PaperCatalog 中。
+    """
+
+    def __init__(self, root: str, verify_on_write: bool = True):
+        """
+        Args:
+            root (str): 存储根目录。
+            verify_on_write (bool): 写入后是否重新计算摘要以确认内容无误，默认开启。
+        """
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.verify_on_write = verify_on_write
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    # 部分生成器会在 %%EOF 之后追加填充或空白，结尾标记在文件末尾这一范围内查找
+    eof_search_bytes = 64 * 1024
+
+    @classmethod
+    def pdf_markers(cls, path: str) -> tuple:
+        """
+        检查文件是否具有PDF文件头，以及文件末尾 eof_search_bytes 字节内是否有 %%EOF 结尾标记。
+
+        Args:
+            path (str): 文件路径。
+
+        Returns:
+            tuple: (是否有文件头, 是否有结尾标记)。
+        """
+        size = os.path.getsize(path)
+        with open(path, 'rb') as file:
+            head = file.read(5)
+            file.seek(max(0, size - cls.eof_search_bytes))
+            tail = file.read()
+        return head == b'%PDF-', b'%%EOF' in tail
+
+    @classmethod
+    def is_complete_pdf(cls, path: str, expected_size: int = 0) -> bool:
+        """
+        检查文件是否为完整的PDF：长度与预期一致，且具有PDF文件头与 %%EOF 结尾标记。
+
+        Args:
+            path (str): 文件路径。
+            expected_size (int): 预期字节数，为0时不检查长度。
+
+        Returns:
+            bool: 文件完整时返回 True。
+        """
+        if expected_size and os.path.getsize(path) != expected_size:
+            return False
+        return all(cls.pdf_markers(path))
+
+    def path_for(self, digest: str) -> str:
+        """
+        计算摘要对应的文件路径。
+
+        Args:
+            digest (str): sha256 十六进制摘要。
+
+        Returns:
+            str: 文件路径。
+        """
+        return os.path.join(self.objects_dir, digest[:2], digest[2:4], f"{digest}.pdf")
+
+    def put(self, src_path: str) -> tuple:
+        """
+        将文件移入存储。内容已存在时直接丢弃源文件。
+
+        Args:
+            src_path (str): 待存入的文件，成功后会被移走或删除。
+
+        Returns:
+            tuple: (sha256 摘要, 存储中的路径)。
+
+        Raises:
+            IOError: 写入后的摘要与源文件不一致。
+        """
+        digest = PaperCatalog.file_sha256(src_path)
+        blob_path = self.path_for(digest)
+
+        if os.path.exists(blob_path) and self.verify(digest, deep=False) \
+                and os.path.getsize(blob_path) == os.path.getsize(src_path):
+            os.remove(src_path)
+            return digest, blob_path
+
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        tmp_path = f"{blob_path}.{os.getpid()}.tmp"
+        try:
+            os.replace(src_path, tmp_path)
+        except OSError:
+            # 跨文件系统时无法直接重命名
+            shutil.copyfile(src_path, tmp_path)
+            os.remove(src_path)
+
+        if self.verify_on_write and PaperCatalog.file_sha256(tmp_path) != digest:
+            os.remove(tmp_path)
+            raise IOError(f"写入存储后校验失败: {src_path}")
+        os.replace(tmp_path, blob_path)
+        return digest, blob_path
+
+    def verify(self, digest: str, deep: bool = True) -> bool:
+        """
+        检查存储中的文件是否完好，无需用 PyPDF2 打开。
+
+        浅层检查只读取文件头与结尾的 %%EOF 标记，可发现截断；深层检查重新计算 sha256，可发现任意损坏。
+        摘要是文件内容的权威依据：缺少结尾标记的文件（部分生成器不写或写在填充之前）只要摘要一致即视为完好。
+
+        Args:
+            digest (str): sha256 十六进制摘要。
+            deep (bool): 是否重新计算摘要，默认开启。
+
+        Returns:
+            bool: 文件存在且完好时返回 True。
+        """
+        blob_path = self.path_for(digest)
+        if not os.path.exists(blob_path):
+            return False
+        has_header, has_eof = self.pdf_markers(blob_path)
+        if not has_header:
+            return False
+        if has_eof and not deep:
+            return True
+        return PaperCatalog.file_sha256(blob_path) == digest
+
+    def iter_digests(self) -> Iterator[str]:
+        """
+        遍历存储中的所有摘要。
+
+        Yields:
+            str: sha256 十六进制摘要。
+        """
+        for shard, _, files in os.walk(self.objects_dir):
+            for file_name in files:
+                if file_name.endswith('.pdf'):
+                    yield file_name[:-len('.pdf')]
+
+    def scan(self, deep: bool = False) -> List[str]:
+        """
+        找出存储中所有损坏或被截断的文件。
+
+        Args:
+            deep (bool): 是否重新计算摘要，默认只做浅层检查。
+
+        Returns:
+            List[str]: 损坏文件的摘要列表。
+        """
+        return [digest for digest in self.iter_digests() if not self.verify(digest, deep=deep)]
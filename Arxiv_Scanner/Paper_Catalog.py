@@ -0,0 +1,382 @@
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Any
+
+
+class PaperCatalog:
+    """
+    已下载 arXiv 论文的本地 SQLite 目录。
+
+    以不带版本号的 arXiv ID 为主键记录版本、标题、分类、PDF路径、大小、sha256 与下载时间，
+    去重与“新增论文”查询均为索引查找，不依赖文件名是否存在。
+    """
+
+    def __init__(self, db_path: str):
+        """
+        打开（必要时创建）目录数据库。
+
+        Args:
+            db_path (str): SQLite 数据库文件路径。
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS papers (
+                    arxiv_id   TEXT PRIMARY KEY,
+                    version    INTEGER NOT NULL,
+                    title      TEXT,
+                    categories TEXT,
+                    pdf_path   TEXT,
+                    size       INTEGER,
+                    sha256     TEXT,
+                    fetched_at REAL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_papers_fetched_at ON papers (fetched_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_papers_sha256 ON papers (sha256)")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS query_matches (
+                    arxiv_id TEXT NOT NULL,
+                    query    TEXT NOT NULL,
+                    PRIMARY KEY (arxiv_id, query)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS watermarks (
+                    query      TEXT NOT NULL,
+                    sort_by    TEXT NOT NULL,
+                    last_date  TEXT NOT NULL,
+                    last_id    TEXT NOT NULL,
+                    updated_at REAL,
+                    PRIMARY KEY (query, sort_by)
+                )
+                """
+            )
+            # 增量翻页因 max_results 上限中断、尚未到达水位线时已处理的区间；span 为区间内的条目数，
+            # 再次翻到区间最新条目时据此直接跳到区间末尾，不重复请求区间内的各页
+            self._conn.execute("DROP TABLE IF EXISTS watermark_cursors")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS watermark_ranges (
+                    query       TEXT NOT NULL,
+                    sort_by     TEXT NOT NULL,
+                    top_date    TEXT NOT NULL,
+                    top_id      TEXT NOT NULL,
+                    cursor_date TEXT NOT NULL,
+                    cursor_id   TEXT NOT NULL,
+                    span        INTEGER NOT NULL,
+                    updated_at  REAL,
+                    PRIMARY KEY (query, sort_by, top_id)
+                )
+                """
+            )
+
+    @staticmethod
+    def split_id(entry_id: str) -> tuple:
+        """
+        将 arXiv 条目ID拆分为基础ID与版本号。
+
+        同时支持 "http://arxiv.org/abs/2401.00001v2"、"2401.00001v2" 与旧式 "hep-th/9901001v1"。
+
+        Args:
+            entry_id (str): 条目ID或 abs 链接。
+
+        Returns:
+            tuple: (基础ID, 版本号)，没有版本后缀时版本号为1。
+        """
+        short_id = entry_id.split('/abs/')[-1]
+        match = re.match(r'^(.*?)(?:v(\d+))?$', short_id)
+        return match.group(1), int(match.group(2) or 1)
+
+    @staticmethod
+    def file_sha256(path: str) -> str:
+        """
+        计算文件的 sha256。
+
+        Args:
+            path (str): 文件路径。
+
+        Returns:
+            str: 十六进制摘要。
+        """
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def get(self, arxiv_id: str) -> Optional[Dict[str, Any]]:
+        """
+        查询单篇论文的记录。
+
+        Args:
+            arxiv_id (str): 不带版本号的 arXiv ID。
+
+        Returns:
+            Optional[Dict[str, Any]]: 记录字典，不存在时返回 None。
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM papers WHERE arxiv_id = ?", (arxiv_id,)).fetchone()
+        return dict(row) if row else None
+
+    def needs_download(self, arxiv_id: str, version: int) -> bool:
+        """
+        判断论文是否尚未收录，或目录中只有更旧的版本。
+
+        Args:
+            arxiv_id (str): 不带版本号的 arXiv ID。
+            version (int): 当前可获取的版本号。
+
+        Returns:
+            bool: 需要下载时返回 True。
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM papers WHERE arxiv_id = ?", (arxiv_id,)).fetchone()
+        return row is None or row['version'] < version
+
+    def filter_new(self, entries: Iterable[tuple]) -> List[tuple]:
+        """
+        批量筛选出尚未收录或有新版本的论文。
+
+        Args:
+            entries (Iterable[tuple]): (基础ID, 版本号) 序列。
+
+        Returns:
+            List[tuple]: 需要下载的 (基础ID, 版本号)，保持输入顺序。
+        """
+        entries = list(entries)
+        known = {}
+        with self._lock:
+            # SQLite 默认最多 999 个绑定参数，分批查询
+            for i in range(0, len(entries), 900):
+                chunk = [arxiv_id for arxiv_id, _ in entries[i:i + 900]]
+                placeholders = ",".join("?" * len(chunk))
+                for row in self._conn.execute(
+                        f"SELECT arxiv_id, version FROM papers WHERE arxiv_id IN ({placeholders})", chunk):
+                    known[row['arxiv_id']] = row['version']
+        return [(arxiv_id, version) for arxiv_id, version in entries
+                if arxiv_id not in known or known[arxiv_id] < version]
+
+    def record(self, arxiv_id: str, version: int, title: str, categories: Iterable[str], pdf_path: str,
+               size: int, sha256: str, fetched_at: Optional[float] = None) -> None:
+        """
+        写入或更新一篇论文的记录；已有更新版本时不会被旧版本覆盖。
+
+        Args:
+            arxiv_id (str): 不带版本号的 arXiv ID。
+            version (int): 版本号。
+            title (str): 论文标题。
+            categories (Iterable[str]): 分类列表。
+            pdf_path (str): 本地PDF路径。
+            size (int): 文件字节数。
+            sha256 (str): 文件 sha256。
+            fetched_at (Optional[float]): 下载时间戳，默认当前时间。
+        """
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO papers (arxiv_id, version, title, categories, pdf_path, size, sha256, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (arxiv_id) DO UPDATE SET
+                    version = excluded.version, title = excluded.title, categories = excluded.categories,
+                    pdf_path = excluded.pdf_path, size = excluded.size, sha256 = excluded.sha256,
+                    fetched_at = excluded.fetched_at
+                WHERE excluded.version >= papers.version
+                """,
+                (arxiv_id, version, title, " ".join(categories), pdf_path, size, sha256, fetched_at)
+            )
+
+    def ids_for_sha256(self, sha256: str) -> List[str]:
+        """
+        查询内容摘要对应的所有论文（相同内容的PDF只保存一份时可能有多篇）。
+
+        Args:
+            sha256 (str): 文件 sha256。
+
+        Returns:
+            List[str]: 不带版本号的 arXiv ID 列表。
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT arxiv_id FROM papers WHERE sha256 = ?", (sha256,)).fetchall()
+        return [row['arxiv_id'] for row in rows]
+
+    def remove(self, arxiv_id: str) -> None:
+        """
+        删除一篇论文的记录。
+
+        Args:
+            arxiv_id (str): 不带版本号的 arXiv ID。
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM papers WHERE arxiv_id = ?", (arxiv_id,))
+
+    def fetched_since(self, timestamp: float) -> List[Dict[str, Any]]:
+        """
+        列出指定时间之后下载的论文。
+
+        Args:
+            timestamp (float): 起始时间戳。
+
+        Returns:
+            List[Dict[str, Any]]: 按下载时间排序的记录。
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM papers WHERE fetched_at >= ? ORDER BY fetched_at", (timestamp,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def record_matches(self, matches: Dict[str, Iterable[str]]) -> None:
+        """
+        记录每篇论文被哪些查询命中。
+
+        Args:
+            matches (Dict[str, Iterable[str]]): {不带版本号的 arXiv ID: 查询列表}。
+        """
+        rows = [(arxiv_id, query) for arxiv_id, queries in matches.items() for query in queries]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO query_matches (arxiv_id, query) VALUES (?, ?)", rows)
+
+    def queries_for(self, arxiv_id: str) -> List[str]:
+        """
+        查询命中过某篇论文的所有查询。
+
+        Args:
+            arxiv_id (str): 不带版本号的 arXiv ID。
+
+        Returns:
+            List[str]: 查询列表。
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query FROM query_matches WHERE arxiv_id = ? ORDER BY query", (arxiv_id,)
+            ).fetchall()
+        return [row['query'] for row in rows]
+
+    def get_watermark(self, query: str, sort_by: str) -> Optional[Dict[str, Any]]:
+        """
+        读取某个查询的增量水位线。
+
+        Args:
+            query (str): 搜索关键词。
+            sort_by (str): 排序方式。
+
+        Returns:
+            Optional[Dict[str, Any]]: {'last_date': datetime, 'last_id': str}，尚无水位线时返回 None。
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_date, last_id FROM watermarks WHERE query = ? AND sort_by = ?", (query, sort_by)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'last_date': datetime.fromisoformat(row['last_date']), 'last_id': row['last_id']}
+
+    def set_watermark(self, query: str, sort_by: str, last_date: datetime, last_id: str) -> None:
+        """
+        更新某个查询的增量水位线。
+
+        Args:
+            query (str): 搜索关键词。
+            sort_by (str): 排序方式。
+            last_date (datetime): 已处理的最新条目的日期。
+            last_id (str): 已处理的最新条目的 arXiv ID（含版本号）。
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO watermarks (query, sort_by, last_date, last_id, updated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (query, sort_by) DO UPDATE SET
+                    last_date = excluded.last_date, last_id = excluded.last_id, updated_at = excluded.updated_at
+                """,
+                (query, sort_by, last_date.isoformat(), last_id, time.time())
+            )
+
+    def get_watermark_ranges(self, query: str, sort_by: str) -> List[Dict[str, Any]]:
+        """
+        读取某个查询在水位线之上已处理的区间。
+
+        Args:
+            query (str): 搜索关键词。
+            sort_by (str): 排序方式。
+
+        Returns:
+            List[Dict[str, Any]]: 按日期降序排列的 {'top_date', 'top_id', 'cursor_date', 'cursor_id', 'span'}，
+                                  即区间的最新与最早条目及区间内的条目数；没有未完成的翻页时为空列表。
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT top_date, top_id, cursor_date, cursor_id, span FROM watermark_ranges
+                WHERE query = ? AND sort_by = ? ORDER BY top_date DESC
+                """,
+                (query, sort_by)
+            ).fetchall()
+        return [
+            {
+                'top_date': datetime.fromisoformat(row['top_date']), 'top_id': row['top_id'],
+                'cursor_date': datetime.fromisoformat(row['cursor_date']), 'cursor_id': row['cursor_id'],
+                'span': row['span'],
+            }
+            for row in rows
+        ]
+
+    def set_watermark_ranges(self, query: str, sort_by: str, ranges: List[Dict[str, Any]]) -> None:
+        """
+        替换某个查询已处理的区间：区间内的条目均已处理，区间之间以及最早区间与水位线之间的条目留待下次继续。
+
+        Args:
+            query (str): 搜索关键词。
+            sort_by (str): 排序方式。
+            ranges (List[Dict[str, Any]]): 格式同 get_watermark_ranges 的返回值。
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM watermark_ranges WHERE query = ? AND sort_by = ?", (query, sort_by))
+            self._conn.executemany(
+                """
+                INSERT INTO watermark_ranges (query, sort_by, top_date, top_id, cursor_date, cursor_id, span, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (query, sort_by, r['top_date'].isoformat(), r['top_id'], r['cursor_date'].isoformat(),
+                     r['cursor_id'], r['span'], now)
+                    for r in ranges
+                ]
+            )
+
+    def clear_watermark_ranges(self, query: str, sort_by: str) -> None:
+        """
+        删除某个查询已处理的区间。
+
+        Args:
+            query (str): 搜索关键词。
+            sort_by (str): 排序方式。
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM watermark_ranges WHERE query = ? AND sort_by = ?", (query, sort_by))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        关闭数据库连接。
+        """
+        with self._lock:
+            self._conn.close()
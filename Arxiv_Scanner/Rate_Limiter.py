@@ -0,0 +1,255 @@
+import time
+import random
+import asyncio
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶。
+
+    令牌以 rate 个/秒的速度补充，最多积累 capacity 个；reserve() 立即预占一个令牌并返回
+    调用方需要等待的秒数，因此同一个桶既可用于线程（time.sleep）也可用于协程（asyncio.sleep）。
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Args:
+            rate (float): 每秒补充的令牌数。
+            capacity (float): 桶容量，即允许的突发请求数。
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        预占令牌。
+
+        Args:
+            tokens (float): 需要的令牌数。
+
+        Returns:
+            float: 需要等待的秒数，0 表示可以立即发送请求。
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """
+        在服务器要求退避（Retry-After）期间暂停整个桶。
+
+        Args:
+            seconds (float): 暂停秒数。
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class RateLimiter:
+    """
+    按主机划分预算的限流器，负责限速、识别限流响应并以带抖动的指数退避重试。
+
+    默认预算遵循 arXiv 的使用建议：API（export.arxiv.org）每3秒1次，PDF（arxiv.org）每秒4次；
+    未配置预算的主机不限速。
+    """
+
+    # 视为暂时性失败、可以重试的HTTP状态码
+    transient_statuses = {429, 500, 502, 503, 504}
+    # 表示服务器正在限流的状态码
+    throttle_statuses = {429, 503}
+
+    def __init__(self, budgets: Optional[Dict[str, tuple]] = None, max_retries: int = 5,
+                 backoff_base: float = 1.0, backoff_max: float = 60.0):
+        """
+        Args:
+            budgets (Optional[Dict[str, tuple]]): {主机名: (每秒请求数, 突发容量)}，默认使用 arXiv 的建议值。
+            max_retries (int): 单个请求遇到暂时性失败时的最大重试次数，默认5。
+            backoff_base (float): 指数退避的基数（秒），默认1。
+            backoff_max (float): 单次退避的上限（秒），默认60。
+        """
+        if budgets is None:
+            budgets = {
+                'export.arxiv.org': (1 / 3, 1),
+                'arxiv.org': (4, 4),
+            }
+        self.buckets = {host: TokenBucket(rate, capacity) for host, (rate, capacity) in budgets.items()}
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def _count(self, host: str, key: str, amount: float = 1) -> None:
+        with self._lock:
+            counter = self.counters.setdefault(host, {'requests': 0, 'throttled': 0, 'retried': 0, 'waited': 0.0})
+            counter[key] += amount
+
+    def _bucket(self, url: str) -> tuple:
+        host = urlsplit(url).hostname or ''
+        return host, self.buckets.get(host)
+
+    def reserve(self, url: str) -> float:
+        """
+        为一次请求预占对应主机的令牌。
+
+        Args:
+            url (str): 请求URL。
+
+        Returns:
+            float: 需要等待的秒数。
+        """
+        host, bucket = self._bucket(url)
+        wait = bucket.reserve() if bucket else 0.0
+        self._count(host, 'requests')
+        if wait > 0:
+            self._count(host, 'waited', wait)
+        return wait
+
+    def wait(self, url: str) -> None:
+        """
+        阻塞直到可以向该URL发送请求。
+
+        Args:
+            url (str): 请求URL。
+        """
+        wait = self.reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def wait_async(self, url: str) -> None:
+        """
+        wait() 的协程版本。
+
+        Args:
+            url (str): 请求URL。
+        """
+        wait = self.reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        计算带完全抖动的指数退避时间。
+
+        Args:
+            attempt (int): 已失败的次数（从1开始）。
+
+        Returns:
+            float: 退避秒数。
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        解析 Retry-After 响应头，支持秒数与HTTP日期两种格式。
+
+        Args:
+            value (Optional[str]): 响应头的值。
+
+        Returns:
+            Optional[float]: 需要等待的秒数，无法解析时返回 None。
+        """
+        if not value:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def retry_delay(self, url: str, attempt: int, status: Optional[int] = None,
+                    retry_after: Optional[str] = None) -> float:
+        """
+        登记一次失败并返回重试前需要等待的时间。
+
+        服务器给出 Retry-After 时以其为准，并暂停该主机的令牌桶，使其他并发请求一同退避。
+
+        Args:
+            url (str): 请求URL。
+            attempt (int): 已失败的次数（从1开始）。
+            status (Optional[int]): HTTP状态码，连接错误时为 None。
+            retry_after (Optional[str]): Retry-After 响应头。
+
+        Returns:
+            float: 等待秒数。
+        """
+        host, bucket = self._bucket(url)
+        self._count(host, 'retried')
+        delay = self.backoff(attempt)
+        if status in self.throttle_statuses:
+            self._count(host, 'throttled')
+            server_delay = self.parse_retry_after(retry_after)
+            if server_delay is not None:
+                delay = min(server_delay, self.backoff_max * 10)
+            if bucket:
+                bucket.pause(delay)
+        return delay
+
+    def snapshot(self) -> Dict[str, dict]:
+        """
+        返回各主机计数器的副本。
+
+        Returns:
+            Dict[str, dict]: {主机名: {'requests', 'throttled', 'retried', 'waited'}}。
+        """
+        with self._lock:
+            return {host: dict(counter) for host, counter in self.counters.items()}
+
+
+class RateLimitedSession(requests.Session):
+    """
+    所有请求都经过 RateLimiter 的 requests 会话：发送前按主机限速，遇到暂时性状态码或连接错误时
+    按 Retry-After 或抖动退避自动重试。
+    """
+
+    def __init__(self, rate_limiter: RateLimiter):
+        """
+        Args:
+            rate_limiter (RateLimiter): 共享的限流器。
+        """
+        super().__init__()
+        self.rate_limiter = rate_limiter
+
+    def request(self, method, url, *args, **kwargs):
+        attempt = 0
+        while True:
+            self.rate_limiter.wait(url)
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                attempt += 1
+                if attempt > self.rate_limiter.max_retries:
+                    raise
+                time.sleep(self.rate_limiter.retry_delay(url, attempt))
+                continue
+
+            if response.status_code not in self.rate_limiter.transient_statuses \
+                    or attempt >= self.rate_limiter.max_retries:
+                return response
+
+            attempt += 1
+            delay = self.rate_limiter.retry_delay(url, attempt, response.status_code,
+                                                  response.headers.get('retry-after'))
+            response.close()
+            time.sleep(delay)
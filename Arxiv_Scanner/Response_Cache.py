@@ -0,0 +1,238 @@
+import time
+import inspect
+import hashlib
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+
+def client_default_temperature(llm: Any) -> Optional[float]:
+    """
+    Returns the temperature an LLM client samples with when `ask` is called without one.
+
+        Args:
+            llm (Any): The LLM client. Wrappers can declare the value as a `default_temperature` attribute;
+                       otherwise it is read from the default of the `temperature` parameter of `ask`.
+
+        Returns:
+            Optional[float]: The default temperature, or None if it cannot be determined.
+    """
+    default = getattr(llm, 'default_temperature', inspect.Parameter.empty)
+    if default is inspect.Parameter.empty:
+        try:
+            default = inspect.signature(llm.ask).parameters['temperature'].default
+        except (KeyError, TypeError, ValueError):
+            default = inspect.Parameter.empty
+    return None if default is inspect.Parameter.empty else default
+
+
+class ResponseCache:
+    """
+    An on-disk SQLite cache of LLM responses.
+
+    Entries are keyed by the model name, the SHA-256 of the prompt and the sampling temperature. Entries
+    older than the TTL are treated as misses and purged, and the total size of the stored responses is
+    capped with the least recently used entries evicted first.
+    """
+
+    def __init__(self, db_path: str, max_bytes: int = 256 * 1024 * 1024, ttl: Optional[float] = None):
+        """
+        Opens (and creates if necessary) the cache database.
+
+            Args:
+                db_path (str): The path to the SQLite database file.
+                max_bytes (int): The maximum total size of the cached responses in bytes. Defaults to 256 MiB.
+                ttl (Optional[float]): How long a response stays valid, in seconds. Never expires by default.
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    model       TEXT NOT NULL,
+                    prompt_hash TEXT NOT NULL,
+                    temperature TEXT NOT NULL,
+                    response    TEXT NOT NULL,
+                    bytes       INTEGER NOT NULL,
+                    created     REAL NOT NULL,
+                    last_used   REAL NOT NULL,
+                    PRIMARY KEY (model, prompt_hash, temperature)
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+
+    @staticmethod
+    def _key(model: str, prompt: str, temperature: Any) -> tuple:
+        return model, hashlib.sha256(prompt.encode('utf-8')).hexdigest(), repr(temperature)
+
+    def get(self, model: str, prompt: str, temperature: Any) -> Optional[str]:
+        """
+        Looks up the cached response to a prompt.
+
+            Args:
+                model (str): The model name.
+                prompt (str): The prompt.
+                temperature (Any): The sampling temperature the prompt is sent with.
+
+            Returns:
+                Optional[str]: The cached response, or None if there is no valid entry.
+        """
+        key = self._key(model, prompt, temperature)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created FROM responses WHERE model = ? AND prompt_hash = ? AND temperature = ?", key
+            ).fetchone()
+            if row is None or (self.ttl is not None and now - row['created'] > self.ttl):
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE responses SET last_used = ? WHERE model = ? AND prompt_hash = ? AND temperature = ?",
+                    (now,) + key
+                )
+        return row['response']
+
+    def put(self, model: str, prompt: str, temperature: Any, response: str) -> None:
+        """
+        Stores a response, then purges expired entries and evicts the least recently used ones if the cache
+        grows beyond max_bytes.
+
+            Args:
+                model (str): The model name.
+                prompt (str): The prompt.
+                temperature (Any): The sampling temperature the prompt was sent with.
+                response (str): The model's response.
+        """
+        key = self._key(model, prompt, temperature)
+        nbytes = len(response.encode('utf-8'))
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO responses (model, prompt_hash, temperature, response, bytes, created, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (model, prompt_hash, temperature) DO UPDATE SET
+                    response = excluded.response, bytes = excluded.bytes,
+                    created = excluded.created, last_used = excluded.last_used
+                """,
+                key + (response, nbytes, now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        if self.ttl is not None:
+            expired = self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,)).rowcount
+            self.evictions += expired
+        total = self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for row in self._conn.execute("SELECT model, prompt_hash, temperature, bytes FROM responses ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((row['model'], row['prompt_hash'], row['temperature']))
+            total -= row['bytes']
+        self._conn.executemany(
+            "DELETE FROM responses WHERE model = ? AND prompt_hash = ? AND temperature = ?", evicted
+        )
+        self.evictions += len(evicted)
+
+    def clear(self) -> None:
+        """
+        Removes all cached entries.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache counters and current size.
+
+            Returns:
+                Dict[str, Any]: A dictionary with 'hits', 'misses', 'evictions', 'entries' and 'bytes'.
+        """
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM responses"
+            ).fetchone()
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': entries,
+                'bytes': total,
+            }
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._conn.close()
+
+
+class CachedLLM:
+    """
+    Wraps an LLM client (anything with `ask(prompt, temperature=...)`, such as JoinAgent's MultiLLM or
+    DeepSeekLLM) and serves repeated prompts from a ResponseCache.
+
+    When `ask` is called without a temperature, the client's own default is used both for the request and
+    for the cache key. Empty responses and failed requests are never cached.
+    """
+
+    def __init__(self, llm: Any, cache: ResponseCache, max_cached_temperature: Optional[float] = None):
+        """
+            Args:
+                llm (Any): The wrapped LLM client.
+                cache (ResponseCache): The response cache.
+                max_cached_temperature (Optional[float]): Requests sampled above this temperature bypass the
+                                                          cache, so they still produce fresh samples. Every
+                                                          temperature is cached by default.
+        """
+        self.llm = llm
+        self.cache = cache
+        self.max_cached_temperature = max_cached_temperature
+        self.model = str(getattr(llm, 'model', None) or getattr(llm, 'version', None) or type(llm).__name__)
+        self.default_temperature = client_default_temperature(llm)
+
+    def __getattr__(self, name: str) -> Any:
+        # Everything except ask (look, embed_text, ...) goes straight to the wrapped client
+        return getattr(self.llm, name)
+
+    def ask(self, prompt: str, temperature: Optional[float] = None) -> str:
+        """
+        Returns the cached response to a prompt, or asks the wrapped client and caches its response.
+
+            Args:
+                prompt (str): The prompt.
+                temperature (Optional[float]): The sampling temperature. Defaults to the client's default.
+
+            Returns:
+                str: The response.
+        """
+        kwargs = {} if temperature is None else {'temperature': temperature}
+        if temperature is None:
+            temperature = self.default_temperature
+        if (self.max_cached_temperature is not None and temperature is not None
+                and temperature > self.max_cached_temperature):
+            return self.llm.ask(prompt, **kwargs)
+
+        response = self.cache.get(self.model, prompt, temperature)
+        if response is not None:
+            return response
+        response = self.llm.ask(prompt, **kwargs)
+        if isinstance(response, str) and response:
+            self.cache.put(self.model, prompt, temperature, response)
+        return response
@@ -1,11 +1,60 @@
 import json
 import os
+import re
+import time
 import concurrent.futures
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from JoinAgent.LLM_Parser import LLMParser
+
+from .Compact_Sections import CompactSections
+from .LLM_Limiter import ConcurrencyLimitedLLM
+from .Response_Cache import CachedLLM, ResponseCache
+
 class Reviewer:
-    def __init__(self, llm):
-        self.llm = llm
+    # 阅读笔记的字段: (fused 模式返回的键, 中文名称, 单独询问时的提示词模板)
+    note_fields = [
+        ("summary", "摘要", "请将以下{section}部分简明扼要地总结，突出关键内容：\n\n{text}\n\n简要总结："),
+        ("strengths", "优点", "请根据以下{section}部分内容，列出该部分的优点：\n\n{text}\n\n优点："),
+        ("weaknesses", "缺点", "请根据以下{section}部分内容，列出该部分的缺点：\n\n{text}\n\n缺点："),
+        ("questions", "问题", "请根据以下{section}部分内容，提出相关的问题：\n\n{text}\n\n问题："),
+    ]
+
+    # 评审报告的评分维度
+    score_metrics = ["soundness", "presentation", "contribution", "rating", "confidence"]
+    score_range = (1, 5)
+
+    def __init__(self, llm, fused_notes=False, batched_scores=False, cache_path=None,
+                 cache_max_bytes=256 * 1024 * 1024, cache_ttl=None, cache_max_temperature=None, max_in_flight=None,
+                 pipelined=False):
+        """
+        参数:
+            llm: 与大模型交互的实例，提供ask函数调用: llm.ask(prompt)
+            fused_notes (bool): 为True时每个章节只发送一次请求，由大模型以结构化格式同时返回摘要、优点、缺点和问题，
+                                解析失败的字段再单独询问；为False时按字段分别请求
+            batched_scores (bool): 为True时用一次请求给出全部维度的评分和理由，评分解析为数字并校验范围，
+                                   只对无效的维度单独重新询问；为False时按维度分别请求并保留原始回复
+            cache_path (str): SQLite响应缓存的路径。设置后相同模型、提示词和温度的请求直接从缓存返回，
+                              重新运行或中断后恢复时已完成的请求不再计费。默认不启用
+            cache_max_bytes (int): 响应缓存的容量上限（字节），超出时淘汰最久未使用的条目。默认256 MiB
+            cache_ttl (float): 缓存条目的有效期（秒）。默认永不过期
+            cache_max_temperature (float): 温度高于此值的请求绕过缓存，每次都重新采样。默认所有温度都缓存
+            max_in_flight (int): 所有论文、所有阶段共享的同时进行中请求数上限，各阶段线程池的大小也不超过此值。
+                                 命中缓存的请求不占用名额。默认不限制
+            pipelined (bool): 为True时 process_file 按章节流水线执行：每个章节压缩完成后立即生成该章节的阅读笔记，
+                              最后一个章节的笔记完成后立即生成评审报告，并在报告的 '_timings' 中记录各任务耗时；
+                              为False时按步骤依次执行，每一步等待所有章节完成
+        """
+        self.max_in_flight = max_in_flight
+        self.pipelined = pipelined
+        self.limiter = ConcurrencyLimitedLLM(llm, max_in_flight) if max_in_flight else None
+        if self.limiter is not None:
+            llm = self.limiter
+        self.cache = ResponseCache(cache_path, cache_max_bytes, cache_ttl) if cache_path else None
+        self.llm = CachedLLM(llm, self.cache, cache_max_temperature) if self.cache is not None else llm
+        self.fused_notes = fused_notes
+        self.batched_scores = batched_scores
+        self.parser = LLMParser()
         self.translations = {
             "abstract": ["中文摘要", "摘要", "概要", "要旨"],
             "introduction": ["引言", "简介", "导论"],
@@ -80,32 +129,59 @@ class Reviewer:
 
     def load_json_data(self, json_file_path):
         """
-        加载JSON格式的数据。
+        加载JSON格式的数据。以 .jsonl 结尾的文件按 process_directory_to_json(stream=True) 的逐行格式读取。
         参数:
-            json_file_path (str): JSON文件的路径
+            json_file_path (str): JSON或JSONL文件的路径
         返回:
-            dict: 解析后的数据
+            dict: 解析后的数据，紧凑格式的记录包装为 CompactSections
         """
         print(f"开始加载JSON数据: {json_file_path}")
         try:
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = dict(self.iter_json_data(json_file_path))
             print(f"成功加载JSON数据，共包含 {len(data)} 个文件。")
             return data
         except Exception as e:
             print(f"加载JSON数据时出错: {e}")
             return {}
 
+    def iter_json_data(self, json_file_path):
+        """
+        逐条读取数据，JSONL文件每次只解析一行，无需将整个文件载入内存。
+        参数:
+            json_file_path (str): JSON或JSONL文件的路径
+        返回:
+            generator: 依次产生 (文件名, 章节数据)，紧凑格式的记录包装为 CompactSections，章节文本在读取时才切片
+        """
+        if not json_file_path.endswith('.jsonl'):
+            with open(json_file_path, 'r', encoding='utf-8') as f:
+                for file_name, file_data in json.load(f).items():
+                    yield file_name, CompactSections.wrap(file_data)
+            return
+
+        # 中断的写入可能把最后一行截断在多字节字符中间，无法解码的字节替换后该行会按无法解析跳过
+        with open(json_file_path, 'r', encoding='utf-8', errors='replace') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    # 中断的写入可能留下不完整的一行
+                    print(f"跳过第 {line_number} 行无法解析的记录: {e}")
+                    continue
+                yield record['file'], CompactSections.wrap(record['sections'])
+
     def identify_and_extract_sections(self, file_data):
         """
         确认并提取文件中的各个章节内容。
         参数:
-            file_data (dict): 单个文件的章节数据
+            file_data (dict): 单个文件的章节数据，可以是紧凑格式的记录
         返回:
             dict: { "标准章节名": "章节文本" }
         """
         print("开始识别并提取章节内容。")
         extracted_sections = {}
+        file_data = CompactSections.wrap(file_data)
         
         # 将file_data的键转换为小写，便于不区分大小写的匹配
         lower_file_data = {k.lower(): v for k, v in file_data.items()}
@@ -170,6 +246,29 @@ class Reviewer:
             print(f"压缩章节 '{section_name}' 时出错: {e}")
             return section_text  # 返回原文以防止数据丢失
 
+    def compress_single_section(self, section, text):
+        """
+        检查单个章节的长度，超过 max_length_dict 中的上限则压缩为摘要。
+        参数:
+            section (str): 标准章节名
+            text (str): 章节文本
+        返回:
+            tuple: (章节名, 处理后的章节文本)
+        """
+        print(f"检查章节: {section}")
+        tokens = len(text)
+        allowed_length = self.max_length_dict.get(section, 1024)
+        print(f"章节 '{section}' 长度: {tokens}，允许的最大长度: {allowed_length}")
+        
+        if tokens > allowed_length:
+            print(f"章节 '{section}' 超过最大长度，开始压缩。")
+            compressed_text = self.compress_section_text(section, text, self.llm, max_length_tokens=allowed_length)
+            print(f"章节 '{section}' 压缩完成。")
+            return (section, compressed_text)
+        else:
+            print(f"章节 '{section}' 长度在允许范围内，无需压缩。")
+            return (section, text)
+
     def compress_sections(self, sections_dict):
         """
         对章节文本进行长度控制，过长则压缩为摘要。
@@ -181,88 +280,112 @@ class Reviewer:
         print("开始对章节文本进行长度控制。")
         processed_sections = {}
 
-        def process_single_section(section, text):
-            print(f"检查章节: {section}")
-            tokens = len(text)
-            allowed_length = self.max_length_dict.get(section, 1024)
-            print(f"章节 '{section}' 长度: {tokens}，允许的最大长度: {allowed_length}")
-            
-            if tokens > allowed_length:
-                print(f"章节 '{section}' 超过最大长度，开始压缩。")
-                compressed_text = self.compress_section_text(section, text, self.llm, max_length_tokens=allowed_length)
-                print(f"章节 '{section}' 压缩完成。")
-                return (section, compressed_text)
-            else:
-                print(f"章节 '{section}' 长度在允许范围内，无需压缩。")
-                return (section, text)
-
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future_to_section = {executor.submit(process_single_section, section, text): section for section, text in sections_dict.items()}
-            for future in concurrent.futures.as_completed(future_to_section):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            futures = [executor.submit(self.compress_single_section, section, text) for section, text in sections_dict.items()]
+            # 按输入的章节顺序收集结果，使后续提示词与线程完成顺序无关，重新运行时可以命中响应缓存
+            for future in futures:
                 section, processed_text = future.result()
                 processed_sections[section] = processed_text
         
         print("章节长度控制完成。")
         return processed_sections
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    def generate_single_note(self, section, text):
+    def generate_note_field(self, section, text, field):
         """
-        生成单个章节的摘要、优点、缺点和问题。
+        单独请求某个章节的一项阅读笔记。
 
         参数:
             section (str): 章节名称
             text (str): 章节文本
+            field (str): note_fields 中的字段键，如 "summary"
 
         返回:
-            tuple: (summary, strength, weakness, question)
+            str: 生成的内容，出错时为空字符串
         """
-        local_summaries = {}
-        local_strengths = []
-        local_weaknesses = []
-        local_questions = []
-        print(f"处理章节: {section}")
-        try:
-            # 按章节生成摘要
-            prompt_summary = f"请将以下{section}部分简明扼要地总结，突出关键内容：\n\n{text}\n\n简要总结："
-            summary = self.llm.ask(prompt_summary)
-            local_summaries[section] = summary
-            print(f"摘要生成完成: {section}")
-        except Exception as e:
-            print(f"生成摘要时出错: {section} - {e}")
-            local_summaries[section] = ""
-        
+        _, label, template = next(entry for entry in self.note_fields if entry[0] == field)
         try:
-            # 按章节生成优点
-            prompt_strength = f"请根据以下{section}部分内容，列出该部分的优点：\n\n{text}\n\n优点："
-            strength = self.llm.ask(prompt_strength)
-            local_strengths.append(strength)
-            print(f"优点生成完成: {section}")
+            result = self.llm.ask(template.format(section=section, text=text))
+            print(f"{label}生成完成: {section}")
+            return result
         except Exception as e:
-            print(f"生成优点时出错: {section} - {e}")
-            local_strengths.append("")
-        
-        try:
-            # 按章节生成缺点
-            prompt_weakness = f"请根据以下{section}部分内容，列出该部分的缺点：\n\n{text}\n\n缺点："
-            weakness = self.llm.ask(prompt_weakness)
-            local_weaknesses.append(weakness)
-            print(f"缺点生成完成: {section}")
-        except Exception as e:
-            print(f"生成缺点时出错: {section} - {e}")
-            local_weaknesses.append("")
-        
+            print(f"生成{label}时出错: {section} - {e}")
+            return ""
+
+    def parse_json_reply(self, response):
+        """
+        解析大模型返回的JSON对象。先对回复中第一个 "{" 到最后一个 "}" 之间的内容使用 json.loads，
+        保留原文的标点并支持 null/true/false；失败时再退回 LLMParser.parse_dict。
+
+        参数:
+            response (str): 大模型的回复
+
+        返回:
+            dict: 解析出的字典
+        """
+        start, end = response.find("{"), response.rfind("}")
+        if start != -1 and end > start:
+            try:
+                parsed = json.loads(response[start:end + 1])
+            except ValueError:
+                parsed = None
+            if isinstance(parsed, dict):
+                return parsed
+        return self.parser.parse_dict(response)
+
+    def generate_fused_note(self, section, text):
+        """
+        用一次请求生成章节的全部阅读笔记字段，章节文本只发送一次。
+
+        参数:
+            section (str): 章节名称
+            text (str): 章节文本
+
+        返回:
+            dict: { 字段键: 内容 }，只包含成功解析出的非空字段；请求或解析失败时为空字典
+        """
+        keys = ", ".join(f'"{field}"' for field, _, _ in self.note_fields)
+        prompt = (
+            f"请阅读以下{section}部分，一次性完成四项任务：简明扼要地总结关键内容（summary）、"
+            f"列出该部分的优点（strengths）、列出该部分的缺点（weaknesses）、提出相关的问题（questions）。\n\n"
+            f"{text}\n\n"
+            f"请只返回一个JSON对象，键为 {keys}，值均为字符串，例如：\n"
+            f'{{"summary": "...", "strengths": "...", "weaknesses": "...", "questions": "..."}}'
+        )
         try:
-            # 按章节生成问题
-            prompt_question = f"请根据以下{section}部分内容，提出相关的问题：\n\n{text}\n\n问题："
-            question = self.llm.ask(prompt_question)
-            local_questions.append(question)
-            print(f"问题生成完成: {section}")
+            parsed = self.parse_json_reply(self.llm.ask(prompt))
         except Exception as e:
-            print(f"生成问题时出错: {section} - {e}")
-            local_questions.append("")
+            print(f"合并生成阅读笔记时出错，改为逐项生成: {section} - {e}")
+            return {}
+
+        note = {}
+        for field, _, _ in self.note_fields:
+            value = parsed.get(field)
+            if isinstance(value, list):
+                value = "\n".join(str(item) for item in value)
+            if isinstance(value, str) and value.strip():
+                note[field] = value.strip()
+        print(f"合并生成阅读笔记完成: {section}（解析出 {len(note)}/{len(self.note_fields)} 项）")
+        return note
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+    def generate_single_note(self, section, text):
+        """
+        生成单个章节的摘要、优点、缺点和问题。fused_notes 模式下先用一次请求生成全部字段，缺失的字段再逐项请求。
+
+        参数:
+            section (str): 章节名称
+            text (str): 章节文本
+
+        返回:
+            tuple: (summary, strength, weakness, question)
+        """
+        print(f"处理章节: {section}")
+        note = self.generate_fused_note(section, text) if self.fused_notes else {}
+        for field, _, _ in self.note_fields:
+            if field not in note:
+                note[field] = self.generate_note_field(section, text, field)
 
-        return (local_summaries, local_strengths, local_weaknesses, local_questions)
+        return ({section: note["summary"]}, [note["strengths"]], [note["weaknesses"]], [note["questions"]])
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def generate_single_score(self, metric, review_text):
@@ -292,6 +415,75 @@ class Reviewer:
             print(f"生成评分时出错: {metric} - {e}")
             return (metric, "")
 
+    def parse_score(self, value):
+        """
+        将评分解析为整数并校验是否在 score_range 范围内。
+
+        参数:
+            value: 大模型返回的评分，可以是数字，也可以是 "分数: 4\n原因:..." 形式的文本；
+                   文本中只接受紧跟 "分数:" 的数字或整段仅为一个数字，不会从原因等其他位置取数
+
+        返回:
+            int | None: 有效的评分，无法解析、不是整数或超出范围时为None（该维度会被重新评分）
+        """
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            score = float(value)
+        elif isinstance(value, str):
+            match = (re.search(r'分数\s*[:：]\s*(\d+(?:\.\d+)?)', value)
+                     or re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*', value))
+            if not match:
+                return None
+            score = float(match.group(1))
+        else:
+            return None
+
+        low, high = self.score_range
+        if not score.is_integer() or not low <= score <= high:
+            return None
+        return int(score)
+
+    def generate_batched_scores(self, review_text):
+        """
+        用一次请求生成全部维度的评分和理由，综合评审文本只发送一次。
+
+        参数:
+            review_text (str): 综合评审文本
+
+        返回:
+            tuple: ({ 维度: 评分 }, { 维度: 理由 })，只包含解析成功且在范围内的维度；请求或解析失败时均为空字典
+        """
+        low, high = self.score_range
+        example = ", ".join(f'"{metric}": {{"score": 3, "reason": "..."}}' for metric in self.score_metrics)
+        prompt = (
+            f"请根据论文内容和以下综合评审，分别给出以下各维度的评分，并简要说明理由。\n\n"
+            f"综合评审：\n{review_text}\n\n"
+            f"维度：{', '.join(self.score_metrics)}\n\n"
+            f"评分（取{low}到{high}之间的整数）\n\n"
+            f"请只返回一个JSON对象，每个维度对应一个包含 score 和 reason 的对象，例如：\n{{{example}}}"
+        )
+        try:
+            parsed = self.parse_json_reply(self.llm.ask(prompt))
+        except Exception as e:
+            print(f"批量生成评分时出错，改为逐项评分: {e}")
+            return {}, {}
+
+        scores = {}
+        reasons = {}
+        for metric in self.score_metrics:
+            entry = parsed.get(metric)
+            if not isinstance(entry, dict):
+                entry = {"score": entry}
+            score = self.parse_score(entry.get("score"))
+            if score is None:
+                print(f"评分无效，将单独重新评分: {metric} - {entry.get('score')!r}")
+                continue
+            scores[metric] = score
+            reasons[metric] = str(entry.get("reason") or "").strip()
+        print(f"批量评分完成: {scores}")
+        return scores, reasons
+
     def generate_notes(self, processed_sections):
         """
         生成阅读笔记，包括摘要、优点、缺点和问题。
@@ -306,19 +498,28 @@ class Reviewer:
             }
         """
         print("开始生成阅读笔记。")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            futures = [executor.submit(self.generate_single_note, section, text) for section, text in processed_sections.items()]
+            section_notes = [future.result() for future in futures]
+        return self.combine_notes(section_notes)
+
+    def combine_notes(self, section_notes):
+        """
+        将各章节的阅读笔记合并为一份。
+        参数:
+            section_notes (list): generate_single_note 返回的 (summary, strength, weakness, question) 列表，按章节顺序排列
+        返回:
+            dict: 与 generate_notes 的返回值格式相同
+        """
         summaries = {}
         strengths = []
         weaknesses = []
         questions = []
-
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = {executor.submit(self.generate_single_note, section, text): section for section, text in processed_sections.items()}
-            for future in concurrent.futures.as_completed(futures):
-                local_summaries, local_strengths, local_weaknesses, local_questions = future.result()
-                summaries.update(local_summaries)
-                strengths.extend(local_strengths)
-                weaknesses.extend(local_weaknesses)
-                questions.extend(local_questions)
+        for local_summaries, local_strengths, local_weaknesses, local_questions in section_notes:
+            summaries.update(local_summaries)
+            strengths.extend(local_strengths)
+            weaknesses.extend(local_weaknesses)
+            questions.extend(local_questions)
         
         # 综合各章节的优点、缺点和问题
         combined_strengths = " ".join(strengths)
@@ -339,7 +540,7 @@ class Reviewer:
         参数:
             notes (dict): 生成的阅读笔记
         返回:
-            dict: 评审报告，包括各类别和评分
+            dict: 评审报告，包括各类别和评分；batched_scores 模式下 'Scores' 为数字（无效时为None），理由在 'Reasons' 中
         """
         print("开始生成评审报告。")
         review_report = {}
@@ -362,16 +563,28 @@ class Reviewer:
             review_report['Review'] = ""
 
         # 生成评分
-        metrics = ["soundness", "presentation", "contribution", "rating", "confidence"]
+        metrics = self.score_metrics
         scores = {}
+        reasons = {}
+        if self.batched_scores:
+            scores, reasons = self.generate_batched_scores(review_report.get('Review', ''))
+            metrics = [metric for metric in self.score_metrics if metric not in scores]
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
             futures = {executor.submit(self.generate_single_score, metric, review_report.get('Review', '')): metric for metric in metrics}
             for future in concurrent.futures.as_completed(futures):
                 metric, score = future.result()
+                if self.batched_scores:
+                    # 单独重新评分的维度同样解析为数字，仍然无效时记为None并保留原始回复
+                    reasons[metric] = score
+                    score = self.parse_score(score)
                 scores[metric] = score
 
-        review_report['Scores'] = scores
+        if self.batched_scores:
+            review_report['Scores'] = {metric: scores.get(metric) for metric in self.score_metrics}
+            review_report['Reasons'] = {metric: reasons.get(metric, "") for metric in self.score_metrics}
+        else:
+            review_report['Scores'] = scores
         print("评审报告生成完成。")
         return review_report
 
@@ -382,13 +595,15 @@ class Reviewer:
             file_data (dict): 单个文件的章节数据
             max_length_dict (dict): { "标准章节名": 最大Token数 }
         返回:
-            dict: 评审报告
+            dict: 评审报告，pipelined 模式下附带 '_timings'
         """
         print("========================================")
         print("开始处理新文件。")
         # Step 1: 确认并提取章节内容
         print("步骤1: 确认并提取章节内容。")
         sections = self.identify_and_extract_sections(file_data)
+        if self.pipelined:
+            return self.process_sections_pipelined(sections)
         
         # Step 2: 对章节文本进行长度控制
         print("步骤2: 对章节文本进行长度控制。")
@@ -405,4 +620,85 @@ class Reviewer:
         
         print("文件处理完成。")
         print("========================================\n")
-        return review_report
\ No newline at end of file
+        return review_report
+
+    def process_sections_pipelined(self, sections):
+        """
+        按依赖关系调度单个文件的任务：每个章节的"压缩 -> 阅读笔记"是一条独立的链，章节之间互不等待；
+        所有章节的笔记完成后生成评审报告。关键路径为最慢的一条章节链加上评审报告，而不是每一步最慢任务之和。
+        参数:
+            sections (dict): { "标准章节名": "章节文本" }
+        返回:
+            dict: 评审报告，'_timings' 中记录总耗时和每个任务的开始、结束时间（相对文件开始处理的秒数）
+        """
+        print("步骤2-3: 按章节流水线压缩文本并生成阅读笔记。")
+        started = time.perf_counter()
+        tasks = []
+
+        def timed(task, section, func, *args):
+            start = time.perf_counter() - started
+            try:
+                return func(*args)
+            finally:
+                end = time.perf_counter() - started
+                tasks.append({'task': task, 'section': section, 'start': round(start, 3),
+                              'end': round(end, 3), 'seconds': round(end - start, 3)})
+
+        def section_chain(section, text):
+            section, text = timed('compress', section, self.compress_single_section, section, text)
+            return timed('notes', section, self.generate_single_note, section, text)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            futures = [executor.submit(section_chain, section, text) for section, text in sections.items()]
+            # 各章节链仍然并发执行，只是按章节顺序合并，保证评审提示词稳定
+            section_notes = [future.result() for future in futures]
+        notes = self.combine_notes(section_notes)
+        print(notes)
+
+        print("步骤4: 生成评审报告。")
+        review_report = timed('review', None, self.generate_review_report, notes)
+        review_report['_timings'] = {
+            'total': round(time.perf_counter() - started, 3),
+            'tasks': sorted(tasks, key=lambda task: task['start']),
+        }
+
+        print("文件处理完成。")
+        print("========================================\n")
+        return review_report
+
+    def review_many(self, data, max_papers=None):
+        """
+        并发评审多篇论文。各论文的各阶段请求共享 max_in_flight 的并发上限，既能用满服务商配额又不会超出。
+        参数:
+            data: { 文件名: 章节数据 }，或 iter_json_data 产生的 (文件名, 章节数据) 序列，按需逐篇读取
+            max_papers (int): 同时处理的论文数，默认为 max_in_flight（未设置时为4）
+        返回:
+            dict: { 文件名: 评审报告 }，按完成顺序排列；处理出错的论文会被跳过
+        """
+        items = iter(data.items() if isinstance(data, dict) else data)
+        max_papers = max_papers or self.max_in_flight or 4
+        print(f"开始并发评审，最多同时处理 {max_papers} 篇论文。")
+        review_reports = {}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_papers) as executor:
+            futures = {}
+            while True:
+                # 只预先提交 max_papers 篇，避免一次性读入全部论文
+                for file_name, file_data in items:
+                    futures[executor.submit(self.process_file, file_data)] = file_name
+                    if len(futures) >= max_papers:
+                        break
+                if not futures:
+                    break
+                done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    file_name = futures.pop(future)
+                    try:
+                        review_reports[file_name] = future.result()
+                        print(f"论文评审完成: {file_name}（{len(review_reports)} 篇）")
+                    except Exception as e:
+                        print(f"评审论文 '{file_name}' 时出错: {e}")
+
+        if self.limiter is not None:
+            print(f"并发评审完成，请求统计: {self.limiter.snapshot()}")
+        return review_reports
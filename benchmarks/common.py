@@ -0,0 +1,62 @@
+import os
+import sys
+import json
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from Arxiv_Scanner.Compact_Sections import CompactSections
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'downloads',
+                              'original_essay.json')
+
+
+def load_corpus(path: str = DEFAULT_CORPUS) -> List[str]:
+    """
+    Loads benchmark documents.
+
+    A JSON file produced by `process_directory_to_json` is turned back into one document per paper by
+    concatenating its sections in order; a directory is read as its TXT files.
+
+        Args:
+            path (str): A JSON output file or a directory of TXT files.
+
+        Returns:
+            List[str]: The documents.
+    """
+    if os.path.isdir(path):
+        documents = []
+        for file_name in sorted(os.listdir(path)):
+            if file_name.lower().endswith('.txt'):
+                with open(os.path.join(path, file_name), 'r', encoding='utf-8') as file:
+                    documents.append(file.read())
+        return documents
+
+    with open(path, 'r', encoding='utf-8') as file:
+        papers = json.load(file)
+    documents = []
+    for record in papers.values():
+        sections = CompactSections.wrap(record)
+        ordered = sorted((sections[name] for name in sections if not name.startswith('_')), key=lambda s: s['start'])
+        documents.append("\n".join(section['text'] for section in ordered))
+    return documents
+
+
+def best_of(func: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Runs a function several times and returns the fastest wall-clock time.
+
+        Args:
+            func (Callable[[], object]): The function to time.
+            repeat (int): The number of runs.
+
+        Returns:
+            float: The best time in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
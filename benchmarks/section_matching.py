@@ -0,0 +1,54 @@
+"""
+Compares the single-pass section matcher in PDFProcessor.filter_iclr_pdf with the previous
+one-regex-per-alias search, and checks that both find the same sections.
+
+    python benchmarks/section_matching.py [corpus.json | txt_dir]
+"""
+import re
+import sys
+from typing import Any, Dict, List
+
+from common import best_of, load_corpus
+
+from Arxiv_Scanner.PDF_Processor import PDFProcessor
+
+
+def legacy_sections(processor: PDFProcessor, content: str) -> List[Dict[str, Any]]:
+    # The per-alias search used by filter_iclr_pdf before the precompiled matcher
+    paper_sections = []
+    for section, titles in processor.normalized_chapters.items():
+        for title in titles:
+            pattern = re.compile(r'(?:(?:\d+\.)*\d+\s+)?\b' + re.escape(title) + r'\b', re.IGNORECASE)
+            for match in pattern.finditer(content):
+                paper_sections.append({'section': section, 'start': match.start()})
+                break
+
+    paper_sections = sorted(paper_sections, key=lambda x: x['start'])
+    unique_sections = []
+    seen = set()
+    for sec in paper_sections:
+        if sec['section'] not in seen:
+            unique_sections.append(sec)
+            seen.add(sec['section'])
+    return unique_sections
+
+
+def main() -> None:
+    documents = load_corpus(*sys.argv[1:2])
+    processor = PDFProcessor()
+
+    mismatches = sum(
+        legacy_sections(processor, content) != sorted(processor.find_sections(content), key=lambda x: x['start'])
+        for content in documents
+    )
+    total_chars = sum(len(content) for content in documents)
+    print(f"{len(documents)} documents, {total_chars / 1e6:.1f}M characters, {mismatches} mismatches")
+
+    legacy = best_of(lambda: [legacy_sections(processor, content) for content in documents], repeat=3)
+    single_pass = best_of(lambda: [processor.find_sections(content) for content in documents], repeat=3)
+    print(f"per-alias regex: {legacy * 1000:.1f} ms")
+    print(f"single pass:     {single_pass * 1000:.1f} ms ({legacy / single_pass:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
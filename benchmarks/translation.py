@@ -0,0 +1,84 @@
+"""
+Compares the one-pass PDFProcessor.translate with the previous implementation, which counted, truncated
+and replaced Chinese section headers one title at a time, and checks that both produce the same output.
+
+Runs on the English corpus (detection only) and on synthetic Chinese theses built from the default headers.
+
+    python benchmarks/translation.py [corpus.json | txt_dir]
+"""
+import io
+import re
+import sys
+import random
+import contextlib
+from typing import List
+
+from common import best_of, load_corpus
+
+from Arxiv_Scanner.PDF_Processor import PDFProcessor
+
+
+def legacy_translate(processor: PDFProcessor, content: str) -> str:
+    # PDFProcessor.translate before the precompiled detector and replacer
+    cnt = 0
+    for k, vs in processor.translations.items():
+        for v in vs:
+            if v in content:
+                cnt += 1
+    if cnt < 3:
+        return content
+
+    for v in ["表格索引", "插图索引"]:
+        if v in content[len(content) // 2:]:
+            content = content[:content.rindex(v, len(content) // 2)]
+
+    for section in ["acknowledgments", "appendices", "references"]:
+        for v in processor.translations.get(section, []):
+            if v in content[len(content) // 2:]:
+                content = content[:content.rindex(v, len(content) // 2)]
+                break
+
+    for eng, chinese_titles in processor.translations.items():
+        for ch_title in chinese_titles:
+            pattern = re.compile(r'\b' + re.escape(ch_title) + r'\b', re.IGNORECASE)
+            content = pattern.sub(f'\n{eng}\n', content)
+    return content
+
+
+def chinese_theses(processor: PDFProcessor, count: int = 20, paragraphs: int = 400) -> List[str]:
+    rng = random.Random(0)
+    filler = "本文提出了一种基于深度学习的方法并在多个数据集上进行了验证模型训练结果表明性能显著提升"
+    headers = [title for titles in processor.translations.values() for title in titles] + ["表格索引", "插图索引"]
+    documents = []
+    for _ in range(count):
+        parts = []
+        for _ in range(paragraphs):
+            if rng.random() < 0.1:
+                parts.append(f"\n{rng.randint(1, 9)} {rng.choice(headers)}\n")
+            parts.append(''.join(rng.choice(filler) for _ in range(rng.randint(50, 300))) + "。 ")
+        documents.append(''.join(parts))
+    return documents
+
+
+def compare(name: str, processor: PDFProcessor, documents: List[str]) -> None:
+    # translate prints a notice for every Chinese document
+    with contextlib.redirect_stdout(io.StringIO()):
+        mismatches = sum(
+            legacy_translate(processor, content) != processor.translate(content) for content in documents
+        )
+        legacy = best_of(lambda: [legacy_translate(processor, content) for content in documents])
+        one_pass = best_of(lambda: [processor.translate(content) for content in documents])
+    total_chars = sum(len(content) for content in documents)
+    print(f"{name}: {len(documents)} documents, {total_chars / 1e6:.1f}M characters, {mismatches} mismatches")
+    print(f"    per-title passes: {legacy * 1000:.1f} ms")
+    print(f"    one pass:         {one_pass * 1000:.1f} ms ({legacy / one_pass:.1f}x)")
+
+
+def main() -> None:
+    processor = PDFProcessor()
+    compare("english", processor, load_corpus(*sys.argv[1:2]))
+    compare("chinese", processor, chinese_theses(processor))
+
+
+if __name__ == '__main__':
+    main()